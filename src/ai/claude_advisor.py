@@ -7,10 +7,37 @@ import re
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from types import MappingProxyType
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Request-type keywords, built once at import rather than on every message
+REBALANCING_KEYWORDS = ("rebalancing", "rebalance", "strategy", "when to rebalance", "how often")
+RECOVERY_KEYWORDS = ("recovery", "drawdown", "crisis", "how long", "underwater")
+EXPLANATION_KEYWORDS = ("explain", "why", "how", "what does", "tell me about")
+FOLLOW_UP_KEYWORDS = ("this portfolio", "the portfolio", "your recommendation", "that allocation")
+
+# Risk tolerance, horizon and goal keywords
+CONSERVATIVE_KEYWORDS = ("conservative", "safe", "low risk", "stable", "capital preservation")
+AGGRESSIVE_KEYWORDS = ("aggressive", "high risk", "growth", "risky", "max return", "maximum return", "highest return", "max growth", "maximum growth", "highest growth")
+BALANCED_KEYWORDS = ("balanced", "moderate", "medium risk")
+LONG_TERM_KEYWORDS = ("retire", "retirement", "long term", "decades", "30 years", "20 years", "15 years")
+SHORT_TERM_KEYWORDS = ("short term", "next year", "1 year", "2 years", "soon", "immediately")
+INCOME_GOAL_KEYWORDS = ("income", "dividend", "yield")
+GROWTH_GOAL_KEYWORDS = ("growth", "appreciation", "returns")
+
+# Asset preference keywords, in the order preferences are reported
+ASSET_PREFERENCE_KEYWORDS = (
+    ("VTIAX", ("international", "global", "vtiax")),
+    ("VTI", ("domestic", "us", "vti")),
+    ("BND", ("bonds", "fixed income", "bnd")),
+    ("VNQ", ("reit", "real estate", "vnq")),
+    ("GLD", ("gold", "commodity", "gld")),
+    ("VWO", ("emerging", "developing", "vwo")),
+    ("QQQ", ("tech", "technology", "growth", "qqq")),
+)
+
 class InvestorProfile(Enum):
     CONSERVATIVE = "conservative"
     BALANCED = "balanced" 
@@ -35,27 +62,29 @@ class ClaudePortfolioAdvisor:
     Provides conversational interface for portfolio recommendations
     """
     
+    # UPGRADED TO 7-ASSET SYSTEM
+    available_assets = ("VTI", "VTIAX", "BND", "VNQ", "GLD", "VWO", "QQQ")
+    
+    # Pre-computed reference portfolios for 7-asset system, shared by every
+    # advisor instance (callers copy before adjusting)
+    reference_portfolios = MappingProxyType({
+        InvestorProfile.CONSERVATIVE: MappingProxyType({
+            "VTI": 0.25, "VTIAX": 0.15, "BND": 0.40, 
+            "VNQ": 0.08, "GLD": 0.07, "VWO": 0.03, "QQQ": 0.02
+        }),
+        InvestorProfile.BALANCED: MappingProxyType({
+            "VTI": 0.35, "VTIAX": 0.20, "BND": 0.20, 
+            "VNQ": 0.10, "GLD": 0.05, "VWO": 0.07, "QQQ": 0.03
+        }),
+        InvestorProfile.AGGRESSIVE: MappingProxyType({
+            "VTI": 0.40, "VTIAX": 0.20, "BND": 0.10, 
+            "VNQ": 0.12, "GLD": 0.03, "VWO": 0.10, "QQQ": 0.05
+        })
+    })
+    
     def __init__(self, backtesting_engine, optimization_engine):
         self.backtesting_engine = backtesting_engine
         self.optimization_engine = optimization_engine
-        # UPGRADED TO 7-ASSET SYSTEM
-        self.available_assets = ["VTI", "VTIAX", "BND", "VNQ", "GLD", "VWO", "QQQ"]
-        
-        # Pre-computed reference portfolios for 7-asset system
-        self.reference_portfolios = {
-            InvestorProfile.CONSERVATIVE: {
-                "VTI": 0.25, "VTIAX": 0.15, "BND": 0.40, 
-                "VNQ": 0.08, "GLD": 0.07, "VWO": 0.03, "QQQ": 0.02
-            },
-            InvestorProfile.BALANCED: {
-                "VTI": 0.35, "VTIAX": 0.20, "BND": 0.20, 
-                "VNQ": 0.10, "GLD": 0.05, "VWO": 0.07, "QQQ": 0.03
-            },
-            InvestorProfile.AGGRESSIVE: {
-                "VTI": 0.40, "VTIAX": 0.20, "BND": 0.10, 
-                "VNQ": 0.12, "GLD": 0.03, "VWO": 0.10, "QQQ": 0.05
-            }
-        }
     
     def parse_natural_language_request(self, user_request: str) -> Dict:
         """
@@ -77,29 +106,29 @@ class ClaudePortfolioAdvisor:
         }
         
         # NEW: Detect different types of requests
-        if any(word in user_message for word in ["rebalancing", "rebalance", "strategy", "when to rebalance", "how often"]):
+        if any(keyword in user_message for keyword in REBALANCING_KEYWORDS):
             parsed["request_type"] = "rebalancing_strategy"
-        elif any(word in user_message for word in ["recovery", "drawdown", "crisis", "how long", "underwater"]):
+        elif any(keyword in user_message for keyword in RECOVERY_KEYWORDS):
             parsed["request_type"] = "recovery_analysis"
-        elif any(word in user_message for word in ["explain", "why", "how", "what does", "tell me about"]):
+        elif any(keyword in user_message for keyword in EXPLANATION_KEYWORDS):
             parsed["request_type"] = "explanation"
         
         # NEW: Detect follow-up questions about previous recommendations
-        if any(word in user_message for word in ["this portfolio", "the portfolio", "your recommendation", "that allocation"]):
+        if any(keyword in user_message for keyword in FOLLOW_UP_KEYWORDS):
             parsed["follow_up_question"] = True
         
         # Risk tolerance keywords - ENHANCED for max return detection
-        if any(word in user_message for word in ["conservative", "safe", "low risk", "stable", "capital preservation"]):
+        if any(keyword in user_message for keyword in CONSERVATIVE_KEYWORDS):
             parsed["risk_tolerance"] = InvestorProfile.CONSERVATIVE
-        elif any(word in user_message for word in ["aggressive", "high risk", "growth", "risky", "max return", "maximum return", "highest return", "max growth", "maximum growth", "highest growth"]):
+        elif any(keyword in user_message for keyword in AGGRESSIVE_KEYWORDS):
             parsed["risk_tolerance"] = InvestorProfile.AGGRESSIVE
-        elif any(word in user_message for word in ["balanced", "moderate", "medium risk"]):
+        elif any(keyword in user_message for keyword in BALANCED_KEYWORDS):
             parsed["risk_tolerance"] = InvestorProfile.BALANCED
             
         # Investment horizon - FIXED timeline logic
-        if any(word in user_message for word in ["retire", "retirement", "long term", "decades", "30 years", "20 years", "15 years"]):
+        if any(keyword in user_message for keyword in LONG_TERM_KEYWORDS):
             parsed["investment_horizon"] = "long_term"
-        elif any(word in user_message for word in ["short term", "next year", "1 year", "2 years", "soon", "immediately"]):
+        elif any(keyword in user_message for keyword in SHORT_TERM_KEYWORDS):
             parsed["investment_horizon"] = "short_term"
         else:
             parsed["investment_horizon"] = "medium_term"
@@ -123,25 +152,15 @@ class ClaudePortfolioAdvisor:
             parsed["investment_horizon"] = "short_term"
             
         # Asset preferences - EXPANDED FOR 7-ASSET SYSTEM
-        if "international" in user_message or "global" in user_message or "vtiax" in user_message:
-            parsed["specific_assets"].append("VTIAX")
-        if "domestic" in user_message or "us" in user_message or "vti" in user_message:
-            parsed["specific_assets"].append("VTI")
-        if "bonds" in user_message or "fixed income" in user_message or "bnd" in user_message:
-            parsed["specific_assets"].append("BND")
-        if "reit" in user_message or "real estate" in user_message or "vnq" in user_message:
-            parsed["specific_assets"].append("VNQ")
-        if "gold" in user_message or "commodity" in user_message or "gld" in user_message:
-            parsed["specific_assets"].append("GLD")
-        if "emerging" in user_message or "developing" in user_message or "vwo" in user_message:
-            parsed["specific_assets"].append("VWO")
-        if "tech" in user_message or "technology" in user_message or "growth" in user_message or "qqq" in user_message:
-            parsed["specific_assets"].append("QQQ")
+        parsed["specific_assets"].extend(
+            symbol for symbol, keywords in ASSET_PREFERENCE_KEYWORDS
+            if any(keyword in user_message for keyword in keywords)
+        )
             
         # Goals
-        if any(word in user_message for word in ["income", "dividend", "yield"]):
+        if any(keyword in user_message for keyword in INCOME_GOAL_KEYWORDS):
             parsed["goals"].append("income")
-        if any(word in user_message for word in ["growth", "appreciation", "returns"]):
+        if any(keyword in user_message for keyword in GROWTH_GOAL_KEYWORDS):
             parsed["goals"].append("growth")
             
         # Amount
@@ -288,7 +307,7 @@ Ask me about specific aspects like rebalancing, risk management, or recovery exp
         
         # Determine base portfolio from risk tolerance
         risk_profile = parsed["risk_tolerance"] or InvestorProfile.BALANCED
-        base_allocation = self.reference_portfolios[risk_profile].copy()
+        base_allocation = dict(self.reference_portfolios[risk_profile])
         
         # CRITICAL FIX: Adjust allocation based on investment horizon
         investment_horizon = parsed.get("investment_horizon", "medium_term")
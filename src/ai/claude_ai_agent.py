@@ -4,6 +4,7 @@ AI Agent implementation replacing rule-based RequestClassifier.
 Uses Claude API with tool-calling capabilities for intelligent request routing and synthesis.
 """
 
+import asyncio
 import json
 import logging
 from typing import Dict, List, Optional, Any, Tuple
@@ -14,6 +15,31 @@ from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
+# Cap concurrent upstream Claude calls across all requests in this process, and
+# reuse one pooled client so calls share TCP/TLS connections.
+MAX_CONCURRENT_CLAUDE_CALLS = int(os.getenv("MAX_CONCURRENT_CLAUDE_CALLS", "16"))
+_CLAUDE_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_CLAUDE_CALLS)
+
+# Cap concurrent analytics tool calls; each one runs a backtest-style analysis
+# on this API, so a single turn's fan-out shouldn't swamp the worker threads.
+MAX_CONCURRENT_TOOL_CALLS = int(os.getenv("MAX_CONCURRENT_TOOL_CALLS", "4"))
+_TOOL_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_TOOL_CALLS)
+_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+
+def _shared_http_client() -> httpx.AsyncClient:
+    """Return the process-wide Claude API client, creating it on first use"""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+        _HTTP_CLIENT = httpx.AsyncClient(timeout=60.0)
+    return _HTTP_CLIENT
+
+async def close_http_client():
+    """Close the shared client (call from the app shutdown event)"""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+
 class AgentResponse(BaseModel):
     """Structured response from AI Agent"""
     recommendation: str
@@ -47,6 +73,20 @@ class ClaudeAIAgent:
         self.tool_registry = ToolRegistry()
         self.tool_handler = ToolCallHandler()
         self.default_portfolio = DEFAULT_PORTFOLIO
+        self.headers = {
+            "Content-Type": "application/json",
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01"
+        }
+    
+    async def _post_messages(self, payload: Dict[str, Any]) -> httpx.Response:
+        """POST to the Messages API through the shared client, within the concurrency cap"""
+        async with _CLAUDE_SEMAPHORE:
+            return await _shared_http_client().post(
+                self.claude_api_url,
+                headers=self.headers,
+                json=payload
+            )
     
     async def process_request(
         self, 
@@ -89,11 +129,6 @@ class ClaudeAIAgent:
         # Get available tools
         tools = self.tool_registry.get_all_tools()
         
-        headers = {
-            "Content-Type": "application/json",
-            "x-api-key": self.api_key
-        }
-        
         payload = {
             "model": self.model,
             "max_tokens": self.max_tokens,
@@ -108,12 +143,7 @@ class ClaudeAIAgent:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    self.claude_api_url,
-                    headers=headers,
-                    json=payload
-                )
+            response = await self._post_messages(payload)
             
             if response.status_code != 200:
                 logger.error(f"Claude API error: {response.status_code} - {response.text}")
@@ -125,8 +155,13 @@ class ClaudeAIAgent:
             logger.error(f"Claude API call failed: {e}")
             raise
     
-    def _build_system_prompt(self, context: Optional[Dict[str, Any]] = None) -> str:
-        """Build context-aware system prompt for Claude"""
+    def _build_system_prompt(self, context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Build context-aware system prompt for Claude as content blocks.
+        The static instructions are marked for prompt caching, so together with
+        the tool definitions ahead of them they are served from cache on repeat
+        calls; per-request context goes in a separate, uncached block.
+        """
         
         base_prompt = """You are an expert AI agent for portfolio analytics and investment recommendations. 
 
@@ -157,22 +192,26 @@ Response approach:
 - Use specific numbers and timeframes
 - Always consider the user's context and goals"""
 
+        system = [{"type": "text", "text": base_prompt, "cache_control": {"type": "ephemeral"}}]
+        
         # Add context-specific guidance
+        context_prompt = ""
         if context:
             if context.get('lastRecommendation'):
-                base_prompt += f"""
-
-IMPORTANT: User has an existing portfolio recommendation:
+                context_prompt += f"""IMPORTANT: User has an existing portfolio recommendation:
 {json.dumps(context['lastRecommendation'], indent=2)}
 
 Use this allocation for analysis tools unless they're asking for a NEW portfolio."""
 
             if context.get('conversationHistory'):
-                base_prompt += f"""
+                if context_prompt:
+                    context_prompt += "\n\n"
+                context_prompt += "Previous conversation context available - maintain continuity with past discussions."
 
-Previous conversation context available - maintain continuity with past discussions."""
+        if context_prompt:
+            system.append({"type": "text", "text": context_prompt})
 
-        return base_prompt
+        return system
     
     def _build_user_message(self, message: str, context: Optional[Dict[str, Any]] = None) -> str:
         """Build comprehensive user message with context"""
@@ -204,26 +243,28 @@ Focus on practical, actionable advice based on the analytics data."""
         
         return user_message
     
-    async def _execute_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Execute all tool calls and collect results"""
+    async def _execute_tool(self, tool_call: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Execute one tool call within the concurrency cap, returning (name, result)"""
+        tool_name = tool_call.get("name")
+        parameters = tool_call.get("input", {})
         
-        results = {}
-        
-        for tool_call in tool_calls:
-            tool_name = tool_call.get("name")
-            parameters = tool_call.get("input", {})
-            
-            try:
+        try:
+            async with _TOOL_SEMAPHORE:
                 result = await self.tool_handler.execute_tool(tool_name, parameters)
-                results[tool_name] = result
-                
-                logger.info(f"Tool {tool_name} executed successfully")
-                
-            except Exception as e:
-                logger.error(f"Tool {tool_name} failed: {e}")
-                results[tool_name] = {"error": str(e)}
+            logger.info(f"Tool {tool_name} executed successfully")
+            return tool_name, result
+            
+        except Exception as e:
+            logger.error(f"Tool {tool_name} failed: {e}")
+            return tool_name, {"error": str(e)}
+    
+    async def _execute_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Execute all tool calls concurrently and collect results"""
         
-        return results
+        # Every tool is a read-only analytics call, so one turn's calls can run
+        # together; gather keeps the original order, so a repeated tool name
+        # still resolves to its last call's result.
+        return dict(await asyncio.gather(*(self._execute_tool(tool_call) for tool_call in tool_calls)))
     
     async def _synthesize_response(
         self, 
@@ -264,11 +305,6 @@ Guidelines:
 - Confidence score should reflect data quality and consistency"""
 
         try:
-            headers = {
-                "Content-Type": "application/json", 
-                "x-api-key": self.api_key
-            }
-            
             payload = {
                 "model": self.model,
                 "max_tokens": 2000,
@@ -280,12 +316,7 @@ Guidelines:
                 ]
             }
             
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    self.claude_api_url,
-                    headers=headers,
-                    json=payload
-                )
+            response = await self._post_messages(payload)
             
             if response.status_code == 200:
                 claude_data = response.json()
@@ -7,10 +7,12 @@ recovery analysis, timeline-based risk recommendations, and extended historical
 This is the complete restored version with all Sprint 2 advanced analytics engines.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import ORJSONResponse
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from pydantic import BaseModel, Field, validator
+from math import fsum
 import logging
 import numpy as np
 
@@ -42,14 +44,20 @@ from ..core.rolling_period_analyzer import (
 )
 from ..core.crisis_period_analyzer import CrisisPeriodAnalyzer
 from ..core.recovery_time_analyzer import RecoveryTimeAnalyzer  
-from ..core.timeline_risk_analyzer import TimelineRiskAnalyzer
+from ..core.timeline_risk_analyzer import TimelineRiskAnalyzer, InvestorProfile, RiskTolerance, LifeStage
 from ..core.rebalancing_strategy_analyzer import RebalancingStrategyAnalyzer
 from ..core.extended_historical_analyzer import ExtendedHistoricalAnalyzer
 from ..core.portfolio_engine_optimized import OptimizedPortfolioEngine
 from ..models.database import get_db
+from .http_cache import StaticJSONPayload
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api/analyze", tags=["analysis"])
+
+# Preformatted error details; exception text goes to the log, not the client
+_INVALID_REQUEST = "Invalid request"
+_TIMELINE_ANALYSIS_FAILED = "Timeline risk analysis failed"
+
+router = APIRouter(prefix="/api/analyze", tags=["analysis"], default_response_class=ORJSONResponse)
 
 # ========================================================================================
 # REQUEST/RESPONSE MODELS
@@ -65,7 +73,7 @@ class PortfolioAllocation(BaseModel):
 
     @validator('allocation')
     def validate_allocation(cls, v):
-        total = sum(v.values())
+        total = fsum(v.values())
         if abs(total - 1.0) > 0.001:
             raise ValueError(f"Allocation must sum to 1.0, got {total:.3f}")
         return v
@@ -439,27 +447,32 @@ async def stress_test_portfolio(
         logger.error(f"Error in crisis stress test: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
+# Crisis periods are static class data, so serve them without building an analyzer
+_CRISIS_PERIODS_PAYLOAD = StaticJSONPayload(CrisisPeriodAnalyzer.CRISIS_PERIODS)
+
 @router.get("/crisis-periods")
-async def get_available_crisis_periods(
-    analyzer: CrisisPeriodAnalyzer = Depends(get_crisis_period_analyzer)
-):
+async def get_available_crisis_periods(request: Request):
     """
     Get list of available crisis periods for analysis
     
     Returns metadata about major historical market crises that can be
     used for stress testing portfolio performance.
     """
-    try:
-        return analyzer.get_crisis_periods()
-        
-    except Exception as e:
-        logger.error(f"Error getting crisis periods: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to get crisis periods: {str(e)}")
+    return _CRISIS_PERIODS_PAYLOAD.response(request)
 
 # ========================================================================================
 # RECOVERY ANALYSIS ENDPOINTS  
 # ========================================================================================
 
+def run_recovery_analysis(request: RecoveryAnalysisRequest, analyzer: RecoveryTimeAnalyzer):
+    """Recovery analysis shared by the endpoint below and in-process callers (chat routing)"""
+    return analyzer.analyze_recovery_patterns(
+        allocation=request.allocation,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        min_drawdown_pct=request.min_drawdown_pct
+    )
+
 @router.post("/recovery-analysis")
 async def analyze_recovery_patterns(
     request: RecoveryAnalysisRequest,
@@ -473,13 +486,7 @@ async def analyze_recovery_patterns(
     to help understand portfolio behavior during market stress.
     """
     try:
-        result = analyzer.analyze_recovery_patterns(
-            allocation=request.allocation,
-            start_date=request.start_date,
-            end_date=request.end_date,
-            min_drawdown_pct=request.min_drawdown_pct
-        )
-        return result
+        return run_recovery_analysis(request, analyzer)
         
     except Exception as e:
         logger.error(f"Error in recovery analysis: {str(e)}")
@@ -502,9 +509,6 @@ async def analyze_timeline_risk(
     appropriate portfolio allocations and risk management strategies.
     """
     try:
-        # Create investor profile
-        from ..core.timeline_risk_analyzer import InvestorProfile, RiskTolerance, LifeStage
-        
         # Determine life stage from age
         age = request.age or 35  # Default age if not provided
         if age < 35:
@@ -528,11 +532,17 @@ async def analyze_timeline_risk(
             current_allocation=request.allocation
         )
         
-        return result
+        # orjson serializes the nested dataclasses, enums and floats natively,
+        # so skip FastAPI's jsonable_encoder walk
+        return ORJSONResponse(result)
         
-    except Exception as e:
-        logger.error(f"Error in timeline risk analysis: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+    except ValueError as e:
+        # e.g. an unknown risk_tolerance; keep exception text out of the response
+        logger.warning("Invalid timeline risk request", exc_info=e)
+        raise HTTPException(status_code=400, detail=_INVALID_REQUEST)
+    except Exception:
+        logger.exception("Error in timeline risk analysis")
+        raise HTTPException(status_code=500, detail=_TIMELINE_ANALYSIS_FAILED)
 
 # ========================================================================================
 # EXTENDED HISTORICAL ANALYSIS ENDPOINTS
@@ -638,92 +648,97 @@ async def compare_period_performance(
 # EXAMPLES AND DOCUMENTATION
 # ========================================================================================
 
-@router.get("/examples")
-async def get_analysis_examples():
-    """
-    Get example requests for all analysis endpoints
-    
-    Returns comprehensive examples showing how to use each endpoint
-    with realistic portfolio allocations and parameters.
-    """
-    return {
-        "rolling_period_analysis": {
-            "single_period": {
-                "endpoint": "POST /api/analyze/rolling-periods",
-                "description": "Single period rolling analysis",
-                "example_request": {
-                    "allocation": {"VTI": 0.6, "VTIAX": 0.3, "BND": 0.1},
-                    "period_years": [5],
-                    "start_date": "2010-01-01T00:00:00Z",
-                    "end_date": "2024-01-01T00:00:00Z"
-                }
-            },
-            "multi_period": {
-                "endpoint": "POST /api/analyze/rolling-periods",
-                "description": "Multi-period comparison analysis",
-                "example_request": {
-                    "allocation": {"VTI": 0.6, "VTIAX": 0.3, "BND": 0.1},
-                    "period_years": [3, 5, 10],
-                    "start_date": "2010-01-01T00:00:00Z",
-                    "end_date": "2024-01-01T00:00:00Z"
-                }
-            }
-        },
-        "crisis_stress_test": {
-            "endpoint": "POST /api/analyze/stress-test",
-            "description": "Crisis period stress testing",
+# Static payload, serialized once at import so requests skip JSON encoding entirely
+ANALYSIS_EXAMPLES = {
+    "rolling_period_analysis": {
+        "single_period": {
+            "endpoint": "POST /api/analyze/rolling-periods",
+            "description": "Single period rolling analysis",
             "example_request": {
                 "allocation": {"VTI": 0.6, "VTIAX": 0.3, "BND": 0.1},
-                "crisis_periods": ["2008-financial-crisis", "2020-covid-crash", "2022-bear-market"]
-            }
-        },
-        "recovery_analysis": {
-            "endpoint": "POST /api/analyze/recovery-analysis",
-            "description": "Recovery time analysis from drawdowns",
-            "example_request": {
-                "allocation": {"VTI": 0.6, "VTIAX": 0.3, "BND": 0.1},
-                "min_drawdown_pct": 0.10,
+                "period_years": [5],
                 "start_date": "2010-01-01T00:00:00Z",
                 "end_date": "2024-01-01T00:00:00Z"
             }
         },
-        "timeline_risk": {
-            "endpoint": "POST /api/analyze/timeline-risk",
-            "description": "Timeline-based risk recommendations",
-            "example_request": {
-                "allocation": {"VTI": 0.6, "VTIAX": 0.3, "BND": 0.1},
-                "investment_horizon_years": 15,
-                "age": 35,
-                "risk_tolerance": "moderate"
-            }
-        },
-        "extended_historical": {
-            "endpoint": "POST /api/analyze/extended-historical",
-            "description": "20-year market cycle analysis",
+        "multi_period": {
+            "endpoint": "POST /api/analyze/rolling-periods",
+            "description": "Multi-period comparison analysis",
             "example_request": {
                 "allocation": {"VTI": 0.6, "VTIAX": 0.3, "BND": 0.1},
-                "start_date": "2004-01-01T00:00:00Z",
+                "period_years": [3, 5, 10],
+                "start_date": "2010-01-01T00:00:00Z",
                 "end_date": "2024-01-01T00:00:00Z"
             }
-        },
-        "period_comparison": {
-            "endpoint": "POST /api/analyze/period-comparison", 
-            "description": "Compare different time periods",
-            "example_request": {
-                "allocation": {"VTI": 0.6, "VTIAX": 0.3, "BND": 0.1},
-                "comparison_periods": [10, 20]
-            }
-        },
-        "portfolio_comparison": {
-            "endpoint": "POST /api/analyze/rolling-periods/compare",
-            "description": "Compare multiple portfolios",
-            "example_request": {
-                "portfolios": {
-                    "Conservative": {"VTI": 0.3, "BND": 0.7},
-                    "Balanced": {"VTI": 0.6, "BND": 0.4},
-                    "Aggressive": {"VTI": 0.8, "VTIAX": 0.2}
-                },
-                "period_years": 5
-            }
+        }
+    },
+    "crisis_stress_test": {
+        "endpoint": "POST /api/analyze/stress-test",
+        "description": "Crisis period stress testing",
+        "example_request": {
+            "allocation": {"VTI": 0.6, "VTIAX": 0.3, "BND": 0.1},
+            "crisis_periods": ["2008-financial-crisis", "2020-covid-crash", "2022-bear-market"]
+        }
+    },
+    "recovery_analysis": {
+        "endpoint": "POST /api/analyze/recovery-analysis",
+        "description": "Recovery time analysis from drawdowns",
+        "example_request": {
+            "allocation": {"VTI": 0.6, "VTIAX": 0.3, "BND": 0.1},
+            "min_drawdown_pct": 0.10,
+            "start_date": "2010-01-01T00:00:00Z",
+            "end_date": "2024-01-01T00:00:00Z"
+        }
+    },
+    "timeline_risk": {
+        "endpoint": "POST /api/analyze/timeline-risk",
+        "description": "Timeline-based risk recommendations",
+        "example_request": {
+            "allocation": {"VTI": 0.6, "VTIAX": 0.3, "BND": 0.1},
+            "investment_horizon_years": 15,
+            "age": 35,
+            "risk_tolerance": "moderate"
+        }
+    },
+    "extended_historical": {
+        "endpoint": "POST /api/analyze/extended-historical",
+        "description": "20-year market cycle analysis",
+        "example_request": {
+            "allocation": {"VTI": 0.6, "VTIAX": 0.3, "BND": 0.1},
+            "start_date": "2004-01-01T00:00:00Z",
+            "end_date": "2024-01-01T00:00:00Z"
+        }
+    },
+    "period_comparison": {
+        "endpoint": "POST /api/analyze/period-comparison", 
+        "description": "Compare different time periods",
+        "example_request": {
+            "allocation": {"VTI": 0.6, "VTIAX": 0.3, "BND": 0.1},
+            "comparison_periods": [10, 20]
+        }
+    },
+    "portfolio_comparison": {
+        "endpoint": "POST /api/analyze/rolling-periods/compare",
+        "description": "Compare multiple portfolios",
+        "example_request": {
+            "portfolios": {
+                "Conservative": {"VTI": 0.3, "BND": 0.7},
+                "Balanced": {"VTI": 0.6, "BND": 0.4},
+                "Aggressive": {"VTI": 0.8, "VTIAX": 0.2}
+            },
+            "period_years": 5
         }
     }
+}
+
+_ANALYSIS_EXAMPLES_PAYLOAD = StaticJSONPayload(ANALYSIS_EXAMPLES)
+
+@router.get("/examples")
+async def get_analysis_examples(request: Request):
+    """
+    Get example requests for all analysis endpoints
+    
+    Returns comprehensive examples showing how to use each endpoint
+    with realistic portfolio allocations and parameters.
+    """
+    return _ANALYSIS_EXAMPLES_PAYLOAD.response(request)
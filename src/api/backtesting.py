@@ -1,13 +1,18 @@
 """
 Backtesting API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import ORJSONResponse
+import asyncio
+import functools
 import logging
+import os
 import time
-from typing import Dict, Any
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Tuple, Union
 
-from src.models.database import get_db
+from src.models.database import SessionLocal
 from src.core.portfolio_engine_optimized import OptimizedPortfolioEngine as PortfolioEngine
 from src.api.models import (
     BacktestRequest, BacktestResponse, PerformanceMetrics, ErrorResponse,
@@ -15,89 +20,236 @@ from src.api.models import (
 )
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api/backtest", tags=["backtesting"])
+router = APIRouter(prefix="/api/backtest", tags=["backtesting"], default_response_class=ORJSONResponse)
+
+# Per-request counters (endpoint, result source) kept in memory instead of
+# logging every request at INFO; exposed via GET /api/backtest/stats
+BACKTEST_COUNTS: Counter = Counter()
+
+
+# Fields the API exposes from the engine's metrics dict (which also carries
+# extras such as years and avg_daily_gain)
+_PERFORMANCE_FIELDS = tuple(PerformanceMetrics.model_fields)
+
+
+def _performance_metrics(metrics_dict: Dict[str, Any]) -> PerformanceMetrics:
+    """Build API metrics from the engine's metrics dict, validating (and coercing
+    any NumPy scalars) so the response is always plain JSON types"""
+    return PerformanceMetrics(
+        **{field: metrics_dict.get(field, 0) for field in _PERFORMANCE_FIELDS}
+    )
+
+
+# In-process cache of backtest responses, so hot allocations skip the engine run.
+# All access happens on the event loop thread, so no lock is needed.
+RESULT_CACHE_MAX_SIZE = 4096
+RESULT_CACHE_TTL_SECONDS = 300
+_RESULT_CACHE: "OrderedDict[tuple, Tuple[float, BacktestResponse]]" = OrderedDict()
+
+
+def _result_cache_key(
+    allocation: Dict[str, float],
+    request: Union[BacktestRequest, SevenAssetBacktestRequest]
+) -> tuple:
+    """Build a canonical cache key from the allocation and backtest parameters"""
+    return (
+        tuple(sorted((symbol, round(weight, 6)) for symbol, weight in allocation.items())),
+        request.initial_value,
+        request.start_date,
+        request.end_date,
+        request.rebalance_frequency
+    )
+
+
+def _get_cached_result(key: tuple) -> Optional[BacktestResponse]:
+    """Look up a live cached response, marking it as most recently used"""
+    entry = _RESULT_CACHE.get(key)
+    if entry is None:
+        return None
+    expires_at, response = entry
+    if expires_at <= time.monotonic():
+        del _RESULT_CACHE[key]
+        return None
+    _RESULT_CACHE.move_to_end(key)
+    return response
+
+
+def _cache_result(key: tuple, response: BacktestResponse) -> None:
+    """Store a response, evicting the least recently used entries beyond the bound"""
+    _RESULT_CACHE[key] = (time.monotonic() + RESULT_CACHE_TTL_SECONDS, response)
+    _RESULT_CACHE.move_to_end(key)
+    while len(_RESULT_CACHE) > RESULT_CACHE_MAX_SIZE:
+        _RESULT_CACHE.popitem(last=False)
+
+
+def invalidate_result_cache() -> None:
+    """Drop all in-process backtest results, e.g. after new price data is ingested"""
+    _RESULT_CACHE.clear()
+    _PREFETCH_HITS.clear()
+
+
+def _backtest_with_own_session(request: Union[BacktestRequest, SevenAssetBacktestRequest]) -> Dict:
+    """Run a backtest on a dedicated session, independent of any request's session"""
+    db = SessionLocal()
+    try:
+        engine = PortfolioEngine(db)
+        return engine.backtest_portfolio(
+            allocation=request.allocation.allocation,
+            initial_value=request.initial_value,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            rebalance_frequency=request.rebalance_frequency
+        )
+    finally:
+        db.close()
+
+
+async def _run_backtest(
+    key: tuple,
+    request: Union[BacktestRequest, SevenAssetBacktestRequest]
+) -> BacktestResponse:
+    """Run the engine in a worker thread and cache the response under key"""
+    start_time = time.perf_counter()
+    results = await asyncio.to_thread(_backtest_with_own_session, request)
+    response = BacktestResponse(
+        success=True,
+        allocation=request.allocation.allocation,
+        initial_value=request.initial_value,
+        final_value=results['final_value'],
+        performance_metrics=_performance_metrics(results['performance_metrics']),
+        calculation_time_seconds=time.perf_counter() - start_time,
+        cache_hit=False
+    )
+    _cache_result(key, response)
+    return response
+
+
+# Concurrent identical backtests share one engine run. The run is a task that
+# owns its own session, so it finishes (and is cached) even if the caller that
+# started it goes away; every caller waits on it through a shield, so cancelling
+# one caller never cancels the run or the other callers.
+_BACKTEST_INFLIGHT: "Dict[tuple, asyncio.Task]" = {}
+
+
+def _forget_backtest(key: tuple, task: asyncio.Task) -> None:
+    """Done-callback: drop a finished run from the in-flight table"""
+    if _BACKTEST_INFLIGHT.get(key) is task:
+        del _BACKTEST_INFLIGHT[key]
+    if not task.cancelled():
+        task.exception()  # callers re-raise it; don't log it as unretrieved
+
+
+async def _backtest_once(
+    key: tuple,
+    request: Union[BacktestRequest, SevenAssetBacktestRequest]
+) -> Tuple[BacktestResponse, bool]:
+    """Run the backtest for key, or join an identical run already in flight
+    
+    Returns the cached response and whether it came from another caller's run.
+    """
+    task = _BACKTEST_INFLIGHT.get(key)
+    shared = task is not None
+    if task is None:
+        task = asyncio.ensure_future(_run_backtest(key, request))
+        _BACKTEST_INFLIGHT[key] = task
+        task.add_done_callback(functools.partial(_forget_backtest, key))
+    return await asyncio.shield(task), shared
+
+
+# Speculative prefetch: an allocation that keeps hitting the cache is likely to be
+# asked for again with the next window, so compute that window in the background.
+# It spends CPU on guesses, so it is off unless BACKTEST_PREFETCH is set, and only
+# starts while no other engine run is in flight; the semaphore caps what does start.
+PREFETCH_ENABLED = os.getenv("BACKTEST_PREFETCH", "").lower() in ("1", "true", "yes")
+PREFETCH_MIN_HITS = 2
+PREFETCH_MAX_CONCURRENCY = 2
+_PREFETCH_TRACK_SIZE = 256
+_PREFETCH_HITS: "OrderedDict[tuple, int]" = OrderedDict()
+_PREFETCH_INFLIGHT: set = set()
+_PREFETCH_TASKS: set = set()
+_PREFETCH_SEMAPHORE = asyncio.Semaphore(PREFETCH_MAX_CONCURRENCY)
+
+
+async def _prefetch_backtest(key: tuple, request: BacktestRequest) -> None:
+    """Compute a backtest in the background; the run stores it in the in-process cache"""
+    try:
+        async with _PREFETCH_SEMAPHORE:
+            await _backtest_once(key, request)
+    except Exception as e:
+        logger.warning(f"Prefetch backtest failed: {e}")
+    finally:
+        _PREFETCH_INFLIGHT.discard(key)
+
+
+def _maybe_prefetch_next_window(key: tuple, request: BacktestRequest) -> None:
+    """Record a cache hit and, for repeat hits, prefetch the window ending a day later"""
+    if not PREFETCH_ENABLED:
+        return
+    
+    hits = _PREFETCH_HITS.pop(key, 0) + 1
+    _PREFETCH_HITS[key] = hits
+    while len(_PREFETCH_HITS) > _PREFETCH_TRACK_SIZE:
+        _PREFETCH_HITS.popitem(last=False)
+    
+    # Worker threads already running a backtest are busy with real requests
+    if hits < PREFETCH_MIN_HITS or _BACKTEST_INFLIGHT or _PREFETCH_SEMAPHORE.locked():
+        return
+    
+    next_end = datetime.strptime(request.end_date, '%Y-%m-%d') + timedelta(days=1)
+    next_request = request.model_copy(update={"end_date": next_end.strftime('%Y-%m-%d')})
+    next_key = _result_cache_key(request.allocation.allocation, next_request)
+    if (next_key in _PREFETCH_INFLIGHT or next_key in _BACKTEST_INFLIGHT
+            or _get_cached_result(next_key) is not None):
+        return
+    
+    _PREFETCH_INFLIGHT.add(next_key)
+    task = asyncio.create_task(_prefetch_backtest(next_key, next_request))
+    _PREFETCH_TASKS.add(task)
+    task.add_done_callback(_PREFETCH_TASKS.discard)
+
 
 @router.post("/portfolio", response_model=BacktestResponse)
-async def backtest_portfolio(
-    request: BacktestRequest,
-    db: Session = Depends(get_db)
-):
+async def backtest_portfolio(request: BacktestRequest):
     """
     Backtest a portfolio with the given allocation and parameters
     
     This endpoint performs a comprehensive backtest of a portfolio allocation
     and returns detailed performance metrics.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
-        logger.info(f"Starting backtest for allocation: {request.allocation.allocation}")
-        
-        # Create portfolio engine
-        engine = PortfolioEngine(db)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Starting backtest for allocation: {request.allocation.allocation}")
         
-        # Check if we have cached results first
         allocation_dict = request.allocation.allocation
-        cached_result = engine.get_cached_portfolio_snapshot(allocation_dict)
         
-        if cached_result:
-            logger.info("Returning cached backtest result")
-            calculation_time = time.time() - start_time
-            
-            # Convert cached result to response format
-            metrics = PerformanceMetrics(
-                total_return=cached_result.total_return or 0,
-                cagr=cached_result.cagr or 0,
-                volatility=cached_result.volatility or 0,
-                max_drawdown=cached_result.max_drawdown or 0,
-                sharpe_ratio=cached_result.sharpe_ratio or 0,
-                sortino_ratio=0,  # Not stored in cache yet
-                win_rate=0,       # Not stored in cache yet
-                total_trading_days=0  # Not stored in cache yet
-            )
-            
-            # Calculate final value from total return
-            final_value = request.initial_value * (1 + metrics.total_return)
-            
-            return BacktestResponse(
-                success=True,
-                allocation=allocation_dict,
-                initial_value=request.initial_value,
-                final_value=final_value,
-                performance_metrics=metrics,
-                calculation_time_seconds=calculation_time,
-                cache_hit=True
-            )
+        # Check the in-process cache before touching the database
+        cache_key = _result_cache_key(allocation_dict, request)
+        memory_result = _get_cached_result(cache_key)
+        if memory_result is not None:
+            BACKTEST_COUNTS["portfolio", "memory"] += 1
+            logger.debug("Returning in-memory cached backtest result")
+            _maybe_prefetch_next_window(cache_key, request)
+            return memory_result.model_copy(update={
+                "calculation_time_seconds": time.perf_counter() - start_time,
+                "cache_hit": True
+            })
         
-        # Run fresh backtest
-        logger.info("Running fresh backtest calculation")
-        results = engine.backtest_portfolio(
-            allocation=allocation_dict,
-            initial_value=request.initial_value,
-            start_date=request.start_date,
-            end_date=request.end_date,
-            rebalance_frequency=request.rebalance_frequency
-        )
+        # Run fresh backtest (or join an identical one already running); the run
+        # uses its own session and caches the response itself
+        logger.debug("Running fresh backtest calculation")
+        response, shared = await _backtest_once(cache_key, request)
         
-        # Save results to cache
-        metrics_dict = results['performance_metrics']
-        engine.save_portfolio_snapshot(allocation_dict, metrics_dict)
+        calculation_time = time.perf_counter() - start_time
+        BACKTEST_COUNTS["portfolio", "shared" if shared else "fresh"] += 1
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Backtest completed in {calculation_time:.2f} seconds")
         
-        # Convert to response format
-        metrics = PerformanceMetrics(**metrics_dict)
-        
-        calculation_time = time.time() - start_time
-        logger.info(f"Backtest completed in {calculation_time:.2f} seconds")
-        
-        return BacktestResponse(
-            success=True,
-            allocation=allocation_dict,
-            initial_value=request.initial_value,
-            final_value=results['final_value'],
-            performance_metrics=metrics,
-            calculation_time_seconds=calculation_time,
-            cache_hit=False
-        )
+        return response.model_copy(update={
+            "calculation_time_seconds": calculation_time,
+            "cache_hit": shared
+        })
         
     except ValueError as e:
         logger.error(f"Validation error during backtest: {e}")
@@ -115,10 +267,7 @@ async def backtest_portfolio(
 
 
 @router.post("/portfolio/7-asset", response_model=BacktestResponse)
-async def backtest_7_asset_portfolio(
-    request: SevenAssetBacktestRequest,
-    db: Session = Depends(get_db)
-):
+async def backtest_7_asset_portfolio(request: SevenAssetBacktestRequest):
     """
     Specialized backtest endpoint for 7-asset diversified portfolios
     
@@ -135,52 +284,42 @@ async def backtest_7_asset_portfolio(
     - VWO (Emerging Markets)
     - QQQ (Technology Growth)
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
-        logger.info(f"Starting 7-asset backtest with allocation: {request.allocation.allocation}")
-        
-        # Create portfolio engine
-        engine = PortfolioEngine(db)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Starting 7-asset backtest with allocation: {request.allocation.allocation}")
         
         # Convert specialized request to standard format
         allocation_dict = request.allocation.allocation
         
-        # Run backtest using the standard engine (works with any allocation)
-        results = engine.backtest_portfolio(
-            allocation=allocation_dict,
-            initial_value=request.initial_value,
-            start_date=request.start_date,
-            end_date=request.end_date,
-            rebalance_frequency=request.rebalance_frequency
-        )
-        
-        # Save results to cache 
-        metrics_dict = results['performance_metrics']
-        engine.save_portfolio_snapshot(allocation_dict, metrics_dict)
-        
-        # Convert to response format with enhanced metrics for 7-asset
-        metrics = PerformanceMetrics(**metrics_dict)
+        # Same engine run as /portfolio, so both endpoints share the in-process cache
+        cache_key = _result_cache_key(allocation_dict, request)
+        memory_result = _get_cached_result(cache_key)
+        if memory_result is not None:
+            BACKTEST_COUNTS["7-asset", "memory"] += 1
+            logger.debug("Returning in-memory cached 7-asset backtest result")
+            return memory_result.model_copy(update={
+                "calculation_time_seconds": time.perf_counter() - start_time,
+                "cache_hit": True
+            })
         
-        calculation_time = time.time() - start_time
-        logger.info(f"7-asset backtest completed in {calculation_time:.2f} seconds")
-        
-        # Add asset breakdown information to the response
-        response = BacktestResponse(
-            success=True,
-            allocation=allocation_dict,
-            initial_value=request.initial_value,
-            final_value=results['final_value'],
-            performance_metrics=metrics,
-            calculation_time_seconds=calculation_time,
-            cache_hit=False
-        )
+        # Run backtest using the standard engine (works with any allocation)
+        response, shared = await _backtest_once(cache_key, request)
+        metrics = response.performance_metrics
         
-        logger.info(f"7-asset portfolio: {len(allocation_dict)} assets, "
-                   f"CAGR: {metrics.cagr:.2%}, "
-                   f"Sharpe: {metrics.sharpe_ratio:.2f}")
+        calculation_time = time.perf_counter() - start_time
+        BACKTEST_COUNTS["7-asset", "shared" if shared else "fresh"] += 1
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"7-asset backtest completed in {calculation_time:.2f} seconds")
+            logger.debug(f"7-asset portfolio: {len(allocation_dict)} assets, "
+                        f"CAGR: {metrics.cagr:.2%}, "
+                        f"Sharpe: {metrics.sharpe_ratio:.2f}")
         
-        return response
+        return response.model_copy(update={
+            "calculation_time_seconds": calculation_time,
+            "cache_hit": shared
+        })
         
     except ValueError as e:
         logger.error(f"Validation error during 7-asset backtest: {e}")
@@ -194,4 +333,20 @@ async def backtest_7_asset_portfolio(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred during 7-asset backtesting"
-        )
\ No newline at end of file
+        )
+
+@router.get("/stats")
+async def get_backtest_stats():
+    """
+    In-process backtest counters and cache occupancy
+    
+    Counts are per worker process and reset on restart.
+    """
+    return {
+        "requests": [
+            {"endpoint": endpoint, "source": source, "count": count}
+            for (endpoint, source), count in sorted(BACKTEST_COUNTS.items())
+        ],
+        "result_cache_size": len(_RESULT_CACHE),
+        "backtests_in_flight": len(_BACKTEST_INFLIGHT)
+    }
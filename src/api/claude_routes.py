@@ -8,20 +8,47 @@ FIXES ITEM 3: Recovery period routing issue
 - Maintains conversational responses
 """
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
-from typing import Optional
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Mapping, Optional
+import asyncio
+import hashlib
+import heapq
 import logging
-import requests
+import orjson
+import httpx
 from datetime import datetime, timedelta
 
 from src.models.database import get_db
-from src.core.portfolio_engine import PortfolioEngine
 from src.core.optimization_engine import OptimizationEngine  
 from src.ai.claude_advisor import ClaudePortfolioAdvisor
+from src.api.analysis_routes import RecoveryAnalysisRequest, get_recovery_analyzer, run_recovery_analysis
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api/chat", tags=["Claude Integration"])
+router = APIRouter(prefix="/api/chat", tags=["Claude Integration"], default_response_class=ORJSONResponse)
+
+# Fallback recommendation used when the conversation has no previous one
+_DEFAULT_ALLOCATION = MappingProxyType({
+    "VTI": 0.40,    # US Total Stock Market
+    "VTIAX": 0.20,  # International Stocks
+    "BND": 0.15,    # US Total Bond Market
+    "VNQ": 0.10,    # US Real Estate (REITs)
+    "GLD": 0.05,    # Gold Commodity
+    "VWO": 0.07,    # Emerging Markets
+    "QQQ": 0.03,    # Technology Growth
+})
+_DEFAULT_METRICS = MappingProxyType({
+    "expected_cagr": 0.115,
+    "expected_volatility": 0.16,
+    "max_drawdown": -0.32,
+    "sharpe_ratio": 0.68,
+    "risk_profile": "balanced",
+})
+_DEFAULT_CONTEXT_RESPONSE = MappingProxyType({"allocation": _DEFAULT_ALLOCATION, **_DEFAULT_METRICS})
 
 # Request/Response Models (keeping existing structure)
 class ConversationContext(BaseModel):
@@ -46,6 +73,82 @@ class ChatResponse(BaseModel):
     risk_profile: str = Field(..., description="Detected risk profile")
     confidence_score: float = Field(..., description="Recommendation confidence (0-1)")
 
+# Request classification keywords, in routing priority order
+RECOVERY_KEYWORDS = (  # ITEM 3 FIX
+    "recovery period", "recovery time", "how long", "duration",
+    "recover", "underwater", "come back", "bounce back",
+    "drawdown recovery", "time to recover"
+)
+CRISIS_KEYWORDS = (
+    "crisis", "bear market", "crash", "stress test",
+    "2008", "2020", "covid", "financial crisis",
+    "market crash", "recession"
+)
+REBALANCING_KEYWORDS = (
+    "rebalancing", "rebalance", "strategy", "when to rebalance",
+    "how often", "threshold", "time based", "new money"
+)
+ROLLING_KEYWORDS = (
+    "rolling", "consistency", "performance", "3 year", "5 year",
+    "rolling period", "consistent", "volatility over time"
+)
+TIMELINE_KEYWORDS = (
+    "timeline", "age", "retirement", "time horizon",
+    "young investor", "near retirement", "lifecycle"
+)
+
+# request_type -> route, in priority order (first category found in the message wins)
+_ROUTING = {
+    request_type: MappingProxyType({'request_type': request_type, 'endpoint': endpoint, 'requires_allocation': requires_allocation, 'method': 'POST'})
+    for request_type, endpoint, requires_allocation in (
+        ('recovery_analysis', '/api/analyze/recovery-analysis', True),
+        ('crisis_analysis', '/api/analyze/crisis-analysis', True),
+        ('rebalancing_analysis', '/api/rebalancing/analyze-strategies', True),
+        ('rolling_analysis', '/api/analyze/rolling-analysis', True),
+        ('timeline_analysis', '/api/analyze/timeline-analysis', False),
+    )
+}
+_DEFAULT_ROUTE = MappingProxyType({'request_type': 'new_portfolio', 'endpoint': '/api/chat/recommend', 'requires_allocation': False, 'method': 'POST'})
+# Keyword groups in routing priority order. Plain substring checks on the
+# lowercased message beat a combined regex here: a lookahead alternation has to
+# try every keyword at every character position.
+_CLASSIFIER_KEYWORDS = (
+    ('recovery_analysis', RECOVERY_KEYWORDS),
+    ('crisis_analysis', CRISIS_KEYWORDS),
+    ('rebalancing_analysis', REBALANCING_KEYWORDS),
+    ('rolling_analysis', ROLLING_KEYWORDS),
+    ('timeline_analysis', TIMELINE_KEYWORDS),
+)
+
+def _match_request_type(message_lower: str) -> Optional[str]:
+    """Return the highest-priority request type whose keyword appears in the message"""
+    for request_type, keywords in _CLASSIFIER_KEYWORDS:
+        if any(keyword in message_lower for keyword in keywords):
+            return request_type
+    return None
+
+# Classifications of recent messages, keyed by a 16-byte digest so the cache
+# can't be made to hold large client-supplied strings. All access happens on
+# the event loop thread, so no lock is needed.
+CLASSIFICATION_CACHE_MAX_SIZE = 4096
+_CLASSIFICATION_CACHE: "OrderedDict[bytes, Optional[str]]" = OrderedDict()
+
+def _classify_message(message_lower: str) -> Optional[str]:
+    """Classify a lowercased message, reusing the result for repeated messages"""
+    key = hashlib.blake2b(message_lower.encode(), digest_size=16).digest()
+    if key in _CLASSIFICATION_CACHE:
+        _CLASSIFICATION_CACHE.move_to_end(key)
+        return _CLASSIFICATION_CACHE[key]
+    request_type = _match_request_type(message_lower)
+    _CLASSIFICATION_CACHE[key] = request_type
+    while len(_CLASSIFICATION_CACHE) > CLASSIFICATION_CACHE_MAX_SIZE:
+        _CLASSIFICATION_CACHE.popitem(last=False)
+    return request_type
+
+def _drawdown_key(period: dict) -> float:
+    """Sort key for drawdown periods returned by the recovery analysis"""
+    return period.get('max_drawdown', 0)
+
 # Enhanced Request Classification System
 class RequestClassifier:
     """Intelligently classify requests and route to appropriate endpoints"""
@@ -54,118 +157,33 @@ class RequestClassifier:
         # API base URL - using same port as main system
         self.api_base = "http://127.0.0.1:8007"
         
-    def classify_request(self, message: str, context: dict = None) -> dict:
+    def classify_request(self, message: str, context: dict = None) -> Mapping[str, object]:
         """
         Classify request type and determine routing
         
-        Returns:
+        Returns a shared read-only route:
         - request_type: 'recovery_analysis', 'crisis_analysis', 'rebalancing', 'new_portfolio'
         - endpoint: API endpoint to call
         - requires_allocation: whether existing portfolio allocation is needed
         """
-        message_lower = message.lower()
-        
-        # Recovery Analysis Detection (ITEM 3 FIX)
-        recovery_keywords = [
-            "recovery period", "recovery time", "how long", "duration", 
-            "recover", "underwater", "come back", "bounce back",
-            "drawdown recovery", "time to recover"
-        ]
-        
-        if any(keyword in message_lower for keyword in recovery_keywords):
-            return {
-                'request_type': 'recovery_analysis',
-                'endpoint': '/api/analyze/recovery-analysis',
-                'requires_allocation': True,
-                'method': 'POST'
-            }
-        
-        # Crisis Analysis Detection  
-        crisis_keywords = [
-            "crisis", "bear market", "crash", "stress test",
-            "2008", "2020", "covid", "financial crisis",
-            "market crash", "recession"
-        ]
-        
-        if any(keyword in message_lower for keyword in crisis_keywords):
-            return {
-                'request_type': 'crisis_analysis', 
-                'endpoint': '/api/analyze/crisis-analysis',
-                'requires_allocation': True,
-                'method': 'POST'
-            }
-        
-        # Rebalancing Analysis Detection
-        rebalancing_keywords = [
-            "rebalancing", "rebalance", "strategy", "when to rebalance",
-            "how often", "threshold", "time based", "new money"
-        ]
-        
-        if any(keyword in message_lower for keyword in rebalancing_keywords):
-            return {
-                'request_type': 'rebalancing_analysis',
-                'endpoint': '/api/rebalancing/analyze-strategies', 
-                'requires_allocation': True,
-                'method': 'POST'
-            }
-        
-        # Rolling Period Analysis Detection
-        rolling_keywords = [
-            "rolling", "consistency", "performance", "3 year", "5 year",
-            "rolling period", "consistent", "volatility over time"
-        ]
-        
-        if any(keyword in message_lower for keyword in rolling_keywords):
-            return {
-                'request_type': 'rolling_analysis',
-                'endpoint': '/api/analyze/rolling-analysis',
-                'requires_allocation': True,
-                'method': 'POST'
-            }
-        
-        # Timeline Risk Analysis Detection
-        timeline_keywords = [
-            "timeline", "age", "retirement", "time horizon",
-            "young investor", "near retirement", "lifecycle"
-        ]
-        
-        if any(keyword in message_lower for keyword in timeline_keywords):
-            return {
-                'request_type': 'timeline_analysis',
-                'endpoint': '/api/analyze/timeline-analysis',
-                'requires_allocation': False,
-                'method': 'POST'
-            }
+        # Routing depends only on the message text, so repeats skip the scan
+        request_type = _classify_message(message.lower())
         
         # Default: Portfolio Recommendation
-        return {
-            'request_type': 'new_portfolio',
-            'endpoint': '/api/chat/recommend',
-            'requires_allocation': False,
-            'method': 'POST'
-        }
-
-    def get_default_allocation(self, last_recommendation: dict = None) -> dict:
-        """Get allocation for analysis - from context or default"""
+        return _ROUTING.get(request_type, _DEFAULT_ROUTE)
+
+    def get_default_allocation(self, last_recommendation: dict = None) -> Mapping[str, float]:
+        """Get allocation for analysis - from context or default (read-only; copy before mutating)"""
         if last_recommendation and 'allocation' in last_recommendation:
             return last_recommendation['allocation']
         
         # Default balanced allocation
-        return {
-            "VTI": 0.40,    # US Total Stock Market
-            "VTIAX": 0.20,  # International Stocks  
-            "BND": 0.15,    # US Total Bond Market
-            "VNQ": 0.10,    # US Real Estate (REITs)
-            "GLD": 0.05,    # Gold Commodity
-            "VWO": 0.07,    # Emerging Markets
-            "QQQ": 0.03     # Technology Growth
-        }
-
-    def create_analysis_request(self, classification: dict, message: str, context: dict = None) -> dict:
-        """Create request payload for analysis endpoints"""
+        return _DEFAULT_ALLOCATION
+
+    def create_analysis_request(self, classification: dict, message: str, allocation: dict) -> dict:
+        """Create request payload for analysis endpoints (allocation from get_default_allocation)"""
         
         if classification['request_type'] == 'recovery_analysis':
-            allocation = self.get_default_allocation(context.get('lastRecommendation') if context else None)
             return {
                 "allocation": allocation,
                 "start_date": "2015-01-02",
@@ -174,7 +192,6 @@ class RequestClassifier:
             }
             
         elif classification['request_type'] == 'crisis_analysis':
-            allocation = self.get_default_allocation(context.get('lastRecommendation') if context else None)
             return {
                 "allocation": allocation,
                 "start_date": "2004-01-02",
@@ -182,7 +199,6 @@ class RequestClassifier:
             }
             
         elif classification['request_type'] == 'rebalancing_analysis':
-            allocation = self.get_default_allocation(context.get('lastRecommendation') if context else None)
             return {
                 "allocation": allocation,
                 "initial_amount": 100000,
@@ -193,7 +209,6 @@ class RequestClassifier:
             }
             
         elif classification['request_type'] == 'rolling_analysis':
-            allocation = self.get_default_allocation(context.get('lastRecommendation') if context else None)
             return {
                 "allocation": allocation,
                 "start_date": "2015-01-02",
@@ -244,7 +259,7 @@ class RequestClassifier:
             else:
                 avg_recovery_readable = f"{avg_recovery_days/30:.1f} months"
             
-            response = f"""📊 **Portfolio Recovery Analysis**
+            parts = [f"""📊 **Portfolio Recovery Analysis**
 
 Based on your portfolio's historical performance, here's what I found about recovery periods:
 
@@ -253,11 +268,12 @@ Based on your portfolio's historical performance, here's what I found about reco
 • **Total Drawdown Periods Analyzed**: {total_drawdowns}
 • **Analysis Period**: 2015-2024
 
-**Detailed Recovery Patterns:**"""
+**Detailed Recovery Patterns:**"""]
             
             # Add details about major recovery periods
             if drawdown_periods:
-                major_drawdowns = sorted(drawdown_periods, key=lambda x: x.get('max_drawdown', 0))[-3:]
+                # Three largest, listed in ascending order
+                major_drawdowns = heapq.nlargest(3, drawdown_periods, key=_drawdown_key)[::-1]
                 
                 for i, period in enumerate(major_drawdowns, 1):
                     max_drawdown = period.get('max_drawdown', 0)
@@ -269,21 +285,19 @@ Based on your portfolio's historical performance, here's what I found about reco
                     else:
                         recovery_readable = f"{recovery_days/30:.1f} months"
                     
-                    response += f"""
-• **Period {i}**: {max_drawdown:.1%} drawdown starting {start_date[:10]}
-  - Recovery time: {recovery_readable}"""
+                    parts.append(f"""• **Period {i}**: {max_drawdown:.1%} drawdown starting {start_date[:10]}
+  - Recovery time: {recovery_readable}""")
             
-            response += f"""
-
+            parts.append(f"""
 **Key Insights:**
 ✅ Your portfolio shows {"good" if avg_recovery_days < 365 else "moderate" if avg_recovery_days < 730 else "longer"} recovery characteristics
 ✅ Historical data shows all major drawdowns eventually recovered
 ✅ Recovery time varies by market conditions and crisis severity
 
 **What This Means:**
-During future market downturns, expect recovery periods averaging {avg_recovery_readable}. Continue regular contributions during drawdowns for best results."""
+During future market downturns, expect recovery periods averaging {avg_recovery_readable}. Continue regular contributions during drawdowns for best results.""")
 
-            return response
+            return "\n".join(parts)
             
         except Exception as e:
             logger.error(f"Error formatting recovery response: {e}")
@@ -308,10 +322,68 @@ During future market downturns, expect recovery periods averaging {avg_recovery_
 # Initialize classifier
 classifier = RequestClassifier()
 
-# Initialize engines with database session
+def _recovery_analysis(payload: dict) -> dict:
+    """Run the recovery analysis directly, returning the same JSON shape as the endpoint"""
+    result = run_recovery_analysis(RecoveryAnalysisRequest(**payload), get_recovery_analyzer())
+    return jsonable_encoder(result)
+
+# Analyses served by this app are called in-process rather than over a loopback
+# HTTP request; anything not listed here still goes through the endpoint URL
+_ANALYSIS_DISPATCH = {
+    'recovery_analysis': _recovery_analysis,
+}
+
+# Pooled client for calls to the analysis endpoints, kept open across requests
+# so each call reuses a keep-alive connection instead of reconnecting
+_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+
+def start_http_client():
+    """Open the shared analysis client (call from the app startup event)"""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+        _HTTP_CLIENT = httpx.AsyncClient(
+            base_url=classifier.api_base,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        )
+
+def analysis_client() -> httpx.AsyncClient:
+    """Return the shared analysis client, opening it if startup hasn't run"""
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+        start_http_client()
+    return _HTTP_CLIENT
+
+async def close_http_client():
+    """Close the shared analysis client (call from the app shutdown event)"""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+
+async def run_analysis(classification: Mapping[str, object], analysis_request: dict) -> dict:
+    """Run a classified analysis in-process when this app serves it, else via its endpoint"""
+    analyze = _ANALYSIS_DISPATCH.get(classification['request_type'])
+    if analyze is not None:
+        logger.debug("Running %s in-process", classification['request_type'])
+        return await asyncio.to_thread(analyze, analysis_request)
+    
+    # Make API call to analysis endpoint
+    logger.debug("Calling analysis endpoint: %s", classification['endpoint'])
+    response = await analysis_client().post(classification['endpoint'], json=analysis_request)
+        
+    if response.status_code != 200:
+        logger.error(f"Analysis API error: {response.status_code} - {response.text}")
+        raise HTTPException(status_code=500, detail="Analysis service unavailable")
+    
+    return orjson.loads(response.content)
+
+# Initialize engines with database session. Every engine shares the caller's
+# session; OptimizationEngine() with no session would check out (and never
+# close) a second connection per request. OptimizationEngine already builds a
+# PortfolioEngine on that session, so the advisor reuses it.
 def get_engines(db: Session = Depends(get_db)):
-    portfolio_engine = PortfolioEngine(db)
-    optimization_engine = OptimizationEngine()
+    optimization_engine = OptimizationEngine(db)
+    portfolio_engine = optimization_engine.portfolio_engine
     claude_advisor = ClaudePortfolioAdvisor(portfolio_engine, optimization_engine)
     return portfolio_engine, optimization_engine, claude_advisor
 
@@ -330,57 +402,53 @@ async def get_portfolio_recommendation(
     - Portfolio requests → generate new recommendations
     """
     try:
-        logger.info(f"Processing request: {request.message}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Processing request: {request.message}")
         
-        # Extract conversation context
+        # Extract conversation context once; the handlers below share this view
         context = request.user_context
-        message_analysis = context.messageAnalysis if context and context.messageAnalysis else {}
         last_recommendation = context.lastRecommendation if context else None
         
         # ENHANCED: Classify request and determine routing
         classification = classifier.classify_request(request.message, 
                                                    context.__dict__ if context else None)
         
-        logger.info(f"Request classified as: {classification['request_type']}")
+        logger.debug("Request classified as: %s", classification['request_type'])
         
         # Handle analytical requests by calling appropriate endpoints
         if classification['request_type'] != 'new_portfolio':
-            return await handle_analysis_request(classification, request, context)
+            response = await handle_analysis_request(classification, request, last_recommendation, db)
+        else:
+            # Handle regular portfolio recommendations (existing logic)
+            response = await handle_portfolio_recommendation(request, db)
         
-        # Handle regular portfolio recommendations (existing logic)
-        return await handle_portfolio_recommendation(request, db)
+        # ChatResponse is validated on construction; serialize it straight to
+        # orjson rather than having FastAPI re-validate it against response_model
+        return ORJSONResponse(response.model_dump())
         
     except Exception as e:
         logger.error(f"Request processing failed: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to process request: {str(e)}")
 
-async def handle_analysis_request(classification: dict, request: ChatRequest, context) -> ChatResponse:
+async def handle_analysis_request(classification: dict, request: ChatRequest, last_recommendation: Optional[dict], db: Session) -> ChatResponse:
     """
     Route analytical requests to appropriate analysis endpoints
     """
     try:
+        # Get allocation for the analysis and the response (from context or default)
+        allocation = dict(classifier.get_default_allocation(last_recommendation))
+        
         # Create analysis request payload
         analysis_request = classifier.create_analysis_request(
             classification, 
             request.message,
-            context.__dict__ if context else None
+            allocation
         )
         
-        # Make API call to analysis endpoint
-        endpoint_url = f"{classifier.api_base}{classification['endpoint']}"
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Request payload: {analysis_request}")
         
-        logger.info(f"Calling analysis endpoint: {endpoint_url}")
-        logger.info(f"Request payload: {analysis_request}")
-        
-        import httpx
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(endpoint_url, json=analysis_request)
-            
-        if response.status_code != 200:
-            logger.error(f"Analysis API error: {response.status_code} - {response.text}")
-            raise HTTPException(status_code=500, detail="Analysis service unavailable")
-        
-        analysis_data = response.json()
+        analysis_data = await run_analysis(classification, analysis_request)
         
         # Format response conversationally
         formatted_response = classifier.format_analysis_response(
@@ -389,34 +457,20 @@ async def handle_analysis_request(classification: dict, request: ChatRequest, co
             request.message
         )
         
-        # Get allocation for response (from context or default)
-        allocation = classifier.get_default_allocation(
-            context.lastRecommendation if context else None
-        )
-        
         # Return in standard ChatResponse format
         return ChatResponse(
             recommendation=formatted_response,
             allocation=allocation,
-            expected_cagr=context.lastRecommendation.get('expected_cagr', 0.115) if context and context.lastRecommendation else 0.115,
-            expected_volatility=context.lastRecommendation.get('expected_volatility', 0.16) if context and context.lastRecommendation else 0.16,
-            max_drawdown=context.lastRecommendation.get('max_drawdown', -0.32) if context and context.lastRecommendation else -0.32,
-            sharpe_ratio=context.lastRecommendation.get('sharpe_ratio', 0.68) if context and context.lastRecommendation else 0.68,
-            risk_profile=context.lastRecommendation.get('risk_profile', 'balanced') if context and context.lastRecommendation else 'balanced',
-            confidence_score=0.85
+            confidence_score=0.85,
+            **recommendation_metrics(last_recommendation)
         )
         
     except Exception as e:
         logger.error(f"Analysis request failed: {e}")
-        # Fallback to explanation from Claude advisor
-        from src.models.database import get_db
-        db = next(get_db())
-        try:
-            portfolio_engine, optimization_engine, claude_advisor = get_engines(db)
-            explanation = claude_advisor.generate_explanation(request.message)
-            return create_context_response(explanation, context.lastRecommendation if context else None)
-        finally:
-            db.close()
+        # Fallback to explanation from Claude advisor, on the endpoint's session
+        portfolio_engine, optimization_engine, claude_advisor = get_engines(db)
+        explanation = await asyncio.to_thread(claude_advisor.generate_explanation, request.message)
+        return create_context_response(explanation, last_recommendation)
 
 async def handle_portfolio_recommendation(request: ChatRequest, db: Session) -> ChatResponse:
     """
@@ -425,8 +479,8 @@ async def handle_portfolio_recommendation(request: ChatRequest, db: Session) ->
     # Get engines with proper database session
     portfolio_engine, optimization_engine, claude_advisor = get_engines(db)
     
-    # Generate new portfolio recommendation
-    recommendation = claude_advisor.generate_recommendation(request.message)
+    # Generate new portfolio recommendation (optimizer work runs off the event loop)
+    recommendation = await asyncio.to_thread(claude_advisor.generate_recommendation, request.message)
     
     if recommendation is None:
         logger.error("generate_recommendation returned None")
@@ -435,43 +489,31 @@ async def handle_portfolio_recommendation(request: ChatRequest, db: Session) ->
     # Format the response
     formatted_response = f"🎯 Portfolio Recommendation: {recommendation.risk_profile.value.title()} allocation with {recommendation.expected_cagr:.1%} expected returns."
     
-    return ChatResponse(
+    # Every field comes from the advisor, not the client, so skip validation.
+    # Backtest metrics may be numpy scalars; float() keeps them orjson-serializable.
+    return ChatResponse.model_construct(
         recommendation=formatted_response,
         allocation=recommendation.allocation,
-        expected_cagr=recommendation.expected_cagr,
-        expected_volatility=recommendation.expected_volatility,
-        max_drawdown=recommendation.max_drawdown,
-        sharpe_ratio=recommendation.sharpe_ratio,
+        expected_cagr=float(recommendation.expected_cagr),
+        expected_volatility=float(recommendation.expected_volatility),
+        max_drawdown=float(recommendation.max_drawdown),
+        sharpe_ratio=float(recommendation.sharpe_ratio),
         risk_profile=recommendation.risk_profile.value,
-        confidence_score=recommendation.confidence_score
+        confidence_score=float(recommendation.confidence_score)
     )
 
+def recommendation_metrics(last_recommendation: dict = None) -> Mapping[str, object]:
+    """Headline metrics from the previous recommendation, falling back to the defaults"""
+    if not last_recommendation:
+        return _DEFAULT_METRICS
+    return {key: last_recommendation.get(key, default) for key, default in _DEFAULT_METRICS.items()}
+
 def create_context_response(response_text: str, last_recommendation: dict = None) -> ChatResponse:
     """Create a response for context-aware queries (keeping existing function)"""
-    default_allocation = {"VTI": 0.40, "VTIAX": 0.20, "BND": 0.15, "VNQ": 0.10, "GLD": 0.05, "VWO": 0.07, "QQQ": 0.03}
-    
-    if last_recommendation:
-        allocation = last_recommendation.get('allocation', default_allocation)
-        expected_cagr = last_recommendation.get('expected_cagr', 0.115)
-        expected_volatility = last_recommendation.get('expected_volatility', 0.16)
-        max_drawdown = last_recommendation.get('max_drawdown', -0.32)
-        sharpe_ratio = last_recommendation.get('sharpe_ratio', 0.68)
-        risk_profile = last_recommendation.get('risk_profile', 'balanced')
-    else:
-        allocation = default_allocation
-        expected_cagr = 0.115
-        expected_volatility = 0.16
-        max_drawdown = -0.32
-        sharpe_ratio = 0.68
-        risk_profile = 'balanced'
-    
-    return ChatResponse(
-        recommendation=response_text,
-        allocation=allocation,
-        expected_cagr=expected_cagr,
-        expected_volatility=expected_volatility,
-        max_drawdown=max_drawdown,
-        sharpe_ratio=sharpe_ratio,
-        risk_profile=risk_profile,
-        confidence_score=0.85
-    )
+    # One merge over the defaults; keys ChatResponse doesn't define are ignored
+    return ChatResponse(**{
+        **_DEFAULT_CONTEXT_RESPONSE,
+        **(last_recommendation or {}),
+        "recommendation": response_text,
+        "confidence_score": 0.85,
+    })
@@ -7,12 +7,18 @@ EVOLUTION: Rule-based RequestClassifier → AI Agent with intelligent orchestrat
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
-from typing import Optional
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Optional, Tuple
+import asyncio
+import hashlib
 import logging
+import orjson
 import os
-from datetime import datetime
+import time
 
 from src.models.database import get_db
 from src.core.portfolio_engine import PortfolioEngine
@@ -20,7 +26,7 @@ from src.core.optimization_engine import OptimizationEngine
 from src.ai.claude_advisor import ClaudePortfolioAdvisor
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api/chat", tags=["Claude AI Agent"])
+router = APIRouter(prefix="/api/chat", tags=["Claude AI Agent"], default_response_class=ORJSONResponse)
 
 # Request/Response Models (enhanced from existing)
 class ConversationContext(BaseModel):
@@ -61,10 +67,66 @@ try:
 except Exception as e:
     logger.warning(f"AI Agent initialization failed, falling back to rule-based: {e}")
     AGENT_AVAILABLE = False
-    
-    # Keep existing RequestClassifier as fallback
-    from src.api.claude_routes import RequestClassifier
-    rule_based_classifier = RequestClassifier()
+
+# Keep existing RequestClassifier as fallback (also used when the agent fails or is saturated)
+from src.api.claude_routes import RequestClassifier, recommendation_metrics, run_analysis
+rule_based_classifier = RequestClassifier()
+
+# Bound agent requests in flight from this router. When every slot is taken,
+# new requests go straight to the rule-based path instead of queueing behind
+# slow Claude calls, and a call that overruns its timeout falls back too.
+AGENT_MAX_CONCURRENCY = int(os.getenv("CLAUDE_MAX_CONCURRENCY", "6"))
+AGENT_TIMEOUT_SECONDS = float(os.getenv("CLAUDE_AGENT_TIMEOUT_SECONDS", "25"))
+_AGENT_SEMAPHORE = asyncio.Semaphore(AGENT_MAX_CONCURRENCY)
+
+# Constant fields of the emergency-fallback response (values go to orjson as-is,
+# so the nested allocation stays a plain dict; never mutate it)
+_EMERGENCY_RESPONSE = MappingProxyType({
+    "allocation": {"VTI": 0.40, "VTIAX": 0.20, "BND": 0.15, "VNQ": 0.10, "GLD": 0.05, "VWO": 0.07, "QQQ": 0.03},
+    "expected_cagr": 0.10,
+    "expected_volatility": 0.15,
+    "max_drawdown": -0.25,
+    "sharpe_ratio": 0.65,
+    "risk_profile": "balanced",
+    "confidence_score": 0.30,
+    "processing_mode": "emergency_fallback",
+    "tool_calls_made": (),
+    "synthesis_quality": "poor",
+})
+
+# In-process cache of agent answers keyed by the question and its context, so
+# retries and repeated questions skip the Claude round trips. All access happens
+# on the event loop thread, so no lock is needed.
+AGENT_CACHE_MAX_SIZE = 1024
+AGENT_CACHE_TTL_SECONDS = 3600
+_AGENT_CACHE: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+def _agent_cache_key(message: str, context: Optional[dict]) -> str:
+    """Hash the normalized message with the context, minus the per-session id"""
+    context_fields = {k: v for k, v in (context or {}).items() if k != "sessionId"}
+    payload = message.strip().lower().encode() + b"\0" + orjson.dumps(
+        context_fields, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+def _get_cached_agent_response(key: str):
+    """Look up a live cached agent response, marking it as most recently used"""
+    entry = _AGENT_CACHE.get(key)
+    if entry is None:
+        return None
+    expires_at, response = entry
+    if expires_at <= time.monotonic():
+        del _AGENT_CACHE[key]
+        return None
+    _AGENT_CACHE.move_to_end(key)
+    return response
+
+def _cache_agent_response(key: str, response) -> None:
+    """Store an agent response, evicting the least recently used entries beyond the bound"""
+    _AGENT_CACHE[key] = (time.monotonic() + AGENT_CACHE_TTL_SECONDS, response)
+    _AGENT_CACHE.move_to_end(key)
+    while len(_AGENT_CACHE) > AGENT_CACHE_MAX_SIZE:
+        _AGENT_CACHE.popitem(last=False)
 
 # Initialize engines with database session
 def get_engines(db: Session = Depends(get_db)):
@@ -93,7 +155,7 @@ async def get_portfolio_recommendation(
     - Intelligent tool selection based on question semantics
     - Synthesis of results from multiple analytics engines
     """
-    start_time = datetime.now()
+    start_ns = time.perf_counter_ns()
     processing_mode = "unknown"
     
     try:
@@ -108,26 +170,27 @@ async def get_portfolio_recommendation(
                 processing_mode = "ai_agent"
                 logger.info("Using AI Agent for request processing")
                 
-                # Process with AI Agent
-                agent_response = await ai_agent.process_request(request.message, context)
-                
-                # Convert to API response format
-                processing_time = int((datetime.now() - start_time).total_seconds() * 1000)
+                # Process with AI Agent, reusing a recent answer to the same question
+                cache_key = _agent_cache_key(request.message, context)
+                agent_response = _get_cached_agent_response(cache_key)
+                if agent_response is None:
+                    if _AGENT_SEMAPHORE.locked():
+                        raise RuntimeError("AI Agent at capacity")
+                    async with _AGENT_SEMAPHORE:
+                        agent_response = await asyncio.wait_for(
+                            ai_agent.process_request(request.message, context),
+                            timeout=AGENT_TIMEOUT_SECONDS
+                        )
+                    if agent_response.synthesis_quality != "poor":
+                        _cache_agent_response(cache_key, agent_response)
                 
-                return ChatResponse(
-                    recommendation=agent_response.recommendation,
-                    allocation=agent_response.allocation,
-                    expected_cagr=agent_response.expected_cagr,
-                    expected_volatility=agent_response.expected_volatility,
-                    max_drawdown=agent_response.max_drawdown,
-                    sharpe_ratio=agent_response.sharpe_ratio,
-                    risk_profile=agent_response.risk_profile,
-                    confidence_score=agent_response.confidence_score,
-                    processing_mode=processing_mode,
-                    tool_calls_made=agent_response.tool_calls_made,
-                    synthesis_quality=agent_response.synthesis_quality,
-                    response_time_ms=processing_time
-                )
+                # AgentResponse is already validated and carries every ChatResponse
+                # field but the processing metadata, so serialize it straight to orjson
+                return ORJSONResponse({
+                    **agent_response.model_dump(),
+                    "processing_mode": processing_mode,
+                    "response_time_ms": (time.perf_counter_ns() - start_ns) // 1_000_000
+                })
                 
             except Exception as e:
                 logger.error(f"AI Agent processing failed, falling back to rule-based: {e}")
@@ -156,55 +219,42 @@ async def get_portfolio_recommendation(
             response.processing_mode = processing_mode
             response.tool_calls_made = [classification['request_type']]
             response.synthesis_quality = "legacy"
-            response.response_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+            response.response_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             
-            return response
+            # Validated when built; skip FastAPI's re-validation against response_model
+            return ORJSONResponse(response.model_dump())
         
     except Exception as e:
         logger.error(f"All processing methods failed: {e}")
-        processing_time = int((datetime.now() - start_time).total_seconds() * 1000)
+        processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
         
-        # Emergency fallback
-        return ChatResponse(
-            recommendation=f"❌ **Processing Error**: I encountered an issue analyzing your request: {str(e)}. Please try rephrasing your question or contact support if this persists.",
-            allocation={"VTI": 0.40, "VTIAX": 0.20, "BND": 0.15, "VNQ": 0.10, "GLD": 0.05, "VWO": 0.07, "QQQ": 0.03},
-            expected_cagr=0.10,
-            expected_volatility=0.15,
-            max_drawdown=-0.25,
-            sharpe_ratio=0.65,
-            risk_profile="balanced",
-            confidence_score=0.30,
-            processing_mode="emergency_fallback",
-            tool_calls_made=[],
-            synthesis_quality="poor",
-            response_time_ms=processing_time
-        )
+        # Emergency fallback: only the message and timing vary, so merge them over
+        # the prebuilt fields and skip building and validating a ChatResponse
+        return ORJSONResponse({
+            **_EMERGENCY_RESPONSE,
+            "recommendation": f"❌ **Processing Error**: I encountered an issue analyzing your request: {str(e)[:200]}. Please try rephrasing your question or contact support if this persists.",
+            "response_time_ms": processing_time
+        })
 
 # Legacy handlers for fallback (keeping existing functions)
 async def handle_analysis_request_legacy(classification: dict, request: ChatRequest, context) -> ChatResponse:
     """Legacy analysis request handler (existing logic)"""
     try:
+        # Previous recommendation, looked up once for the allocation and the metrics
+        last_recommendation = context.get('lastRecommendation') if context else None
+        
+        # Get allocation for the analysis and the response
+        allocation = dict(rule_based_classifier.get_default_allocation(last_recommendation))
+        
         # Create analysis request payload
         analysis_request = rule_based_classifier.create_analysis_request(
             classification, 
             request.message,
-            context
+            allocation
         )
         
-        # Make API call to analysis endpoint
-        endpoint_url = f"{rule_based_classifier.api_base}{classification['endpoint']}"
-        
-        logger.info(f"Calling analysis endpoint: {endpoint_url}")
-        
-        import httpx
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(endpoint_url, json=analysis_request)
-            
-        if response.status_code != 200:
-            logger.error(f"Analysis API error: {response.status_code} - {response.text}")
-            raise HTTPException(status_code=500, detail="Analysis service unavailable")
-        
-        analysis_data = response.json()
+        # In-process for analyses this app serves, otherwise over the shared client
+        analysis_data = await run_analysis(classification, analysis_request)
         
         # Format response conversationally
         formatted_response = rule_based_classifier.format_analysis_response(
@@ -213,21 +263,12 @@ async def handle_analysis_request_legacy(classification: dict, request: ChatRequ
             request.message
         )
         
-        # Get allocation for response
-        allocation = rule_based_classifier.get_default_allocation(
-            context.get('lastRecommendation') if context else None
-        )
-        
         # Return in standard ChatResponse format
         return ChatResponse(
             recommendation=formatted_response,
             allocation=allocation,
-            expected_cagr=context.get('lastRecommendation', {}).get('expected_cagr', 0.115) if context else 0.115,
-            expected_volatility=context.get('lastRecommendation', {}).get('expected_volatility', 0.16) if context else 0.16,
-            max_drawdown=context.get('lastRecommendation', {}).get('max_drawdown', -0.32) if context else -0.32,
-            sharpe_ratio=context.get('lastRecommendation', {}).get('sharpe_ratio', 0.68) if context else 0.68,
-            risk_profile=context.get('lastRecommendation', {}).get('risk_profile', 'balanced') if context else 'balanced',
-            confidence_score=0.85
+            confidence_score=0.85,
+            **recommendation_metrics(last_recommendation)
         )
         
     except Exception as e:
@@ -239,8 +280,8 @@ async def handle_portfolio_recommendation_legacy(request: ChatRequest, db: Sessi
     # Get engines with proper database session
     portfolio_engine, optimization_engine, claude_advisor = get_engines(db)
     
-    # Generate new portfolio recommendation
-    recommendation = claude_advisor.generate_recommendation(request.message)
+    # Generate new portfolio recommendation (optimizer work runs off the event loop)
+    recommendation = await asyncio.to_thread(claude_advisor.generate_recommendation, request.message)
     
     if recommendation is None:
         logger.error("generate_recommendation returned None")
@@ -261,6 +302,13 @@ async def handle_portfolio_recommendation_legacy(request: ChatRequest, db: Sessi
     )
 
 # Health check endpoints for monitoring
+
+# Cached agent liveness; "responsive" is None until the first probe completes
+AGENT_PROBE_TTL_SECONDS = 30
+AGENT_PROBE_TIMEOUT_SECONDS = 2.0
+_AGENT_PROBE = {"checked_at": float("-inf"), "responsive": None}
+_AGENT_PROBE_TASK: Optional[asyncio.Task] = None
+
 @router.get("/agent-status")
 async def get_agent_status():
     """Check AI Agent availability and system status"""
@@ -272,18 +320,43 @@ async def get_agent_status():
     }
     
     if AGENT_AVAILABLE:
-        try:
-            # Test agent responsiveness  
-            test_response = await ai_agent._call_claude_with_tools(
-                "Test message", 
-                None
-            )
-            status["agent_responsive"] = True
-        except:
-            status["agent_responsive"] = False
+        # Report the last probe result and refresh it in the background when stale,
+        # so status checks never wait on (or pile up behind) a Claude API call
+        if time.monotonic() - _AGENT_PROBE["checked_at"] >= AGENT_PROBE_TTL_SECONDS:
+            _start_agent_probe()
+        status["agent_responsive"] = _AGENT_PROBE["responsive"]
     
     return status
 
+async def _probe_agent():
+    """Send a test message to the agent and record whether it answered in time"""
+    try:
+        await asyncio.wait_for(
+            ai_agent._call_claude_with_tools("Test message", None),
+            timeout=AGENT_PROBE_TIMEOUT_SECONDS
+        )
+        _AGENT_PROBE["responsive"] = True
+    except Exception:
+        _AGENT_PROBE["responsive"] = False
+    _AGENT_PROBE["checked_at"] = time.monotonic()
+
+# The warm-up probe is a real (billed) tool-calling request, made once per worker
+# at boot, so it is opt-in. Startup hooks only run when this router is mounted.
+AGENT_WARMUP_ENABLED = os.getenv("CLAUDE_AGENT_WARMUP", "").lower() in ("1", "true", "yes")
+
+@router.on_event("startup")
+async def warm_up_agent():
+    """Probe the agent once at startup, when CLAUDE_AGENT_WARMUP is set"""
+    if AGENT_AVAILABLE and AGENT_WARMUP_ENABLED:
+        await _probe_agent()
+        logger.info("AI Agent warm-up %s", "succeeded" if _AGENT_PROBE["responsive"] else "failed")
+
+def _start_agent_probe():
+    """Launch a background probe unless one is already running"""
+    global _AGENT_PROBE_TASK
+    if _AGENT_PROBE_TASK is None or _AGENT_PROBE_TASK.done():
+        _AGENT_PROBE_TASK = asyncio.create_task(_probe_agent())
+
 # Configuration endpoint for switching modes
 @router.post("/configure")
 async def configure_agent(
@@ -0,0 +1,47 @@
+"""
+Second-resolution wall clock for response metadata timestamps
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_NOW_ISO: str = datetime.now().isoformat(timespec="seconds")
+_TICKER: Optional[asyncio.Task] = None
+
+
+async def _tick():
+    """Refresh the cached timestamp once per second"""
+    global _NOW_ISO
+    while True:
+        _NOW_ISO = datetime.now().isoformat(timespec="seconds")
+        await asyncio.sleep(1)
+
+
+def now_iso() -> str:
+    """Current time as an ISO string, accurate to the second while the ticker runs"""
+    if _TICKER is None or _TICKER.done():
+        return datetime.now().isoformat(timespec="seconds")
+    return _NOW_ISO
+
+
+def start_clock():
+    """Start the background ticker (call from the app startup event)"""
+    global _TICKER
+    if _TICKER is None or _TICKER.done():
+        _TICKER = asyncio.create_task(_tick())
+        logger.info("Started cached clock ticker")
+
+
+async def stop_clock():
+    """Cancel the background ticker (call from the app shutdown event)"""
+    global _TICKER
+    if _TICKER is not None:
+        _TICKER.cancel()
+        try:
+            await _TICKER
+        except asyncio.CancelledError:
+            pass
+        _TICKER = None
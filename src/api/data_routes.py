@@ -2,43 +2,78 @@
 Data management API endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Float, cast, func, select, text
 import logging
-from typing import List
+import orjson
+import time
+from datetime import date
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from src.models.database import get_db
+from src.models.database import async_session, get_db, get_async_db
 from src.models.schemas import Asset, DailyPrice
 from src.core.data_manager import DataManager
+from src.api.backtesting import invalidate_result_cache
 from src.api.models import (
-    AssetListResponse, AssetInfo, PriceDataResponse, PriceData, DataStatusResponse
+    AssetListResponse, AssetInfo, PriceDataResponse, DataStatusResponse
 )
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api/data", tags=["data"])
+router = APIRouter(prefix="/api/data", tags=["data"], default_response_class=ORJSONResponse)
+
+# The asset table only changes on /refresh, so it is held in memory keyed by
+# symbol, loaded at startup and reloaded after a short TTL (other workers may
+# refresh). All access happens on the event loop thread, so no lock is needed.
+ASSET_CACHE_TTL_SECONDS = 60
+_ASSET_CACHE: Optional[Tuple[float, Dict[str, AssetInfo], AssetListResponse]] = None
+
+
+def invalidate_asset_cache() -> None:
+    """Drop the cached assets, e.g. after new data is ingested"""
+    global _ASSET_CACHE
+    _ASSET_CACHE = None
+
+
+async def _load_assets(db: AsyncSession) -> Tuple[Dict[str, AssetInfo], AssetListResponse]:
+    """Assets by symbol plus the list response, from memory while fresh"""
+    global _ASSET_CACHE
+    if _ASSET_CACHE is not None and _ASSET_CACHE[0] > time.monotonic():
+        return _ASSET_CACHE[1], _ASSET_CACHE[2]
+    
+    result = await db.execute(select(Asset))
+    assets = {
+        asset.symbol: AssetInfo(
+            symbol=asset.symbol,
+            name=asset.name,
+            asset_class=asset.asset_class,
+            expense_ratio=float(asset.expense_ratio) if asset.expense_ratio else None
+        )
+        for asset in result.scalars()
+    }
+    asset_list = AssetListResponse(assets=list(assets.values()), count=len(assets))
+    _ASSET_CACHE = (time.monotonic() + ASSET_CACHE_TTL_SECONDS, assets, asset_list)
+    return assets, asset_list
+
+
+async def preload_assets():
+    """Load the asset table into memory (call from the app startup event)"""
+    try:
+        async with async_session() as db:
+            await _load_assets(db)
+    except Exception as e:
+        logger.warning(f"Asset preload failed, assets will load on first request: {e}")
+
 
 @router.get("/assets", response_model=AssetListResponse)
-async def list_assets(db: Session = Depends(get_db)):
+async def list_assets(db: AsyncSession = Depends(get_async_db)):
     """
     Get list of all available assets for backtesting
     """
     try:
-        assets = db.query(Asset).all()
-        
-        asset_list = [
-            AssetInfo(
-                symbol=asset.symbol,
-                name=asset.name,
-                asset_class=asset.asset_class,
-                expense_ratio=float(asset.expense_ratio) if asset.expense_ratio else None
-            )
-            for asset in assets
-        ]
-        
-        return AssetListResponse(
-            assets=asset_list,
-            count=len(asset_list)
-        )
+        _, asset_list = await _load_assets(db)
+        return asset_list
         
     except Exception as e:
         logger.error(f"Error fetching assets: {e}")
@@ -48,12 +83,13 @@ async def list_assets(db: Session = Depends(get_db)):
         )
 
 @router.get("/assets/{symbol}/info", response_model=AssetInfo)
-async def get_asset_info(symbol: str, db: Session = Depends(get_db)):
+async def get_asset_info(symbol: str, db: AsyncSession = Depends(get_async_db)):
     """
     Get detailed information about a specific asset
     """
     try:
-        asset = db.query(Asset).filter(Asset.symbol == symbol.upper()).first()
+        assets, _ = await _load_assets(db)
+        asset = assets.get(symbol.upper())
         
         if not asset:
             raise HTTPException(
@@ -61,12 +97,7 @@ async def get_asset_info(symbol: str, db: Session = Depends(get_db)):
                 detail=f"Asset {symbol} not found"
             )
             
-        return AssetInfo(
-            symbol=asset.symbol,
-            name=asset.name,
-            asset_class=asset.asset_class,
-            expense_ratio=float(asset.expense_ratio) if asset.expense_ratio else None
-        )
+        return asset
         
     except HTTPException:
         raise
@@ -75,49 +106,52 @@ async def get_asset_info(symbol: str, db: Session = Depends(get_db)):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch asset information"
-        )@router.get("/prices/{symbol}", response_model=PriceDataResponse)
+        )
+
+# Rows fetched per round trip while streaming /prices
+PRICE_STREAM_BATCH_SIZE = 500
+
+@router.get("/prices/{symbol}", response_model=PriceDataResponse)
 async def get_price_data(
     symbol: str, 
     start_date: str = "2015-01-01",
     end_date: str = "2024-12-31",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get historical price data for a specific asset
     """
+    # Async drivers bind dates strictly, so parse the query strings up front
+    try:
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Dates must be in YYYY-MM-DD format"
+        )
+    
     try:
-        # Query price data
-        prices = db.query(DailyPrice).filter(
-            DailyPrice.symbol == symbol.upper(),
-            DailyPrice.date >= start_date,
-            DailyPrice.date <= end_date
-        ).order_by(DailyPrice.date).all()
+        # Summarize the range first, so a missing series is still a 404 and the
+        # count/date_range are known before the body starts streaming
+        summary = (await db.execute(
+            select(func.count(), func.min(DailyPrice.date), func.max(DailyPrice.date)).where(
+                DailyPrice.symbol == symbol.upper(),
+                DailyPrice.date >= start,
+                DailyPrice.date <= end
+            )
+        )).one()
+        count, first_date, last_date = summary
         
-        if not prices:
+        if not count:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"No price data found for {symbol}"
             )
-            
-        price_list = [
-            PriceData(
-                date=price.date,
-                symbol=price.symbol,
-                adj_close=float(price.adj_close),
-                volume=price.volume,
-                dividend=float(price.dividend) if price.dividend else None
-            )
-            for price in prices
-        ]
         
-        return PriceDataResponse(
-            symbol=symbol.upper(),
-            data=price_list,
-            count=len(price_list),
-            date_range={
-                "start": str(prices[0].date),
-                "end": str(prices[-1].date)
-            }
+        return StreamingResponse(
+            _stream_prices(symbol.upper(), start, end, count, first_date, last_date),
+            media_type="application/json"
         )
         
     except HTTPException:
@@ -129,6 +163,40 @@ async def get_price_data(
             detail="Failed to fetch price data"
         )
 
+async def _stream_prices(
+    symbol: str, start: date, end: date, count: int, first_date: date, last_date: date
+) -> AsyncIterator[bytes]:
+    """
+    Yield a PriceDataResponse-shaped JSON body, sending rows as the DB returns them
+    
+    Runs on its own session: the request's session is closed before the body is sent.
+    """
+    yield b'{"symbol":' + orjson.dumps(symbol) + b',"data":['
+    async with async_session() as db:
+        result = await db.stream(
+            select(
+                DailyPrice.date,
+                DailyPrice.symbol,
+                cast(DailyPrice.adj_close, Float).label("adj_close"),
+                DailyPrice.volume,
+                # A zero dividend is reported as null, as before
+                func.nullif(cast(DailyPrice.dividend, Float), 0).label("dividend")
+            ).where(
+                DailyPrice.symbol == symbol,
+                DailyPrice.date >= start,
+                DailyPrice.date <= end
+            ).order_by(DailyPrice.date).execution_options(yield_per=PRICE_STREAM_BATCH_SIZE)
+        )
+        separator = b""
+        async for rows in result.partitions():
+            # The DB returns floats, so each batch is one orjson call with the
+            # surrounding brackets stripped
+            yield separator + orjson.dumps([row._asdict() for row in rows])[1:-1]
+            separator = b","
+    yield b'],"count":' + orjson.dumps(count) + b',"date_range":' + orjson.dumps(
+        {"start": str(first_date), "end": str(last_date)}
+    ) + b'}'
+
 @router.post("/refresh")
 async def refresh_data(db: Session = Depends(get_db)):
     """
@@ -141,6 +209,10 @@ async def refresh_data(db: Session = Depends(get_db)):
         # Refresh data for all assets
         result = data_manager.refresh_all_data()
         
+        # New prices make any in-memory backtest results and assets stale
+        invalidate_result_cache()
+        invalidate_asset_cache()
+        
         logger.info("Data refresh completed successfully")
         return {
             "success": True,
@@ -156,33 +228,30 @@ async def refresh_data(db: Session = Depends(get_db)):
         )
 
 @router.get("/status", response_model=DataStatusResponse)
-async def get_data_status(db: Session = Depends(get_db)):
+async def get_data_status(db: AsyncSession = Depends(get_async_db)):
     """
     Get current data status and statistics
     """
     try:
-        # Get total records count
-        total_records = db.query(DailyPrice).count()
-        
-        # Get assets count
-        assets_count = db.query(Asset).count()
-        
-        # Get date range
-        date_range = db.execute(text("""
-            SELECT MIN(date) as oldest_date, MAX(date) as latest_date 
+        # Record count, asset count and date range in one round trip
+        stats = (await db.execute(text("""
+            SELECT COUNT(*) AS total_records,
+                   (SELECT COUNT(*) FROM assets) AS assets_count,
+                   MIN(date) AS oldest_date,
+                   MAX(date) AS latest_date
             FROM daily_prices
-        """)).fetchone()
+        """))).one()
         
-        oldest_date = str(date_range.oldest_date) if date_range.oldest_date else None
-        latest_date = str(date_range.latest_date) if date_range.latest_date else None
+        oldest_date = str(stats.oldest_date) if stats.oldest_date else None
+        latest_date = str(stats.latest_date) if stats.latest_date else None
         
         # Determine status
-        status = "healthy" if total_records > 0 else "no_data"
+        data_status = "healthy" if stats.total_records > 0 else "no_data"
         
         return DataStatusResponse(
-            status=status,
-            total_records=total_records,
-            assets_count=assets_count,
+            status=data_status,
+            total_records=stats.total_records,
+            assets_count=stats.assets_count,
             latest_date=latest_date,
             oldest_date=oldest_date
         )
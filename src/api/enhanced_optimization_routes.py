@@ -5,10 +5,13 @@ Provides comprehensive portfolio optimization with crisis analysis,
 rolling period consistency, and advanced risk metrics.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import ORJSONResponse
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+import asyncio
 import logging
+import threading
 
 from ..optimization.portfolio_optimizer_enhanced import (
     EnhancedPortfolioOptimizer, 
@@ -16,14 +19,24 @@ from ..optimization.portfolio_optimizer_enhanced import (
     AccountType,
     PortfolioRequest
 )
+from .http_cache import StaticJSONPayload
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/enhanced", tags=["Enhanced Portfolio Optimization"])
+router = APIRouter(prefix="/api/enhanced", tags=["Enhanced Portfolio Optimization"], default_response_class=ORJSONResponse)
 
 # Initialize the enhanced optimizer
 enhanced_optimizer = EnhancedPortfolioOptimizer()
 
+# The shared optimizer's engines hold one DB session between them, which is not
+# safe to use from two threads at once, so worker-thread runs take turns.
+_OPTIMIZER_LOCK = threading.Lock()
+
+def _run_enhanced_optimization(portfolio_request: PortfolioRequest) -> List[EnhancedPortfolioResult]:
+    """Run the shared optimizer in a worker thread, one request at a time"""
+    with _OPTIMIZER_LOCK:
+        return enhanced_optimizer.optimize_enhanced_portfolio(portfolio_request)
+
 # Pydantic models for API
 class EnhancedOptimizationRequest(BaseModel):
     """Enhanced portfolio optimization request"""
@@ -42,6 +55,8 @@ class EnhancedOptimizationRequest(BaseModel):
 
 class CrisisAnalysisResponse(BaseModel):
     """Crisis analysis results for API response"""
+    model_config = ConfigDict(from_attributes=True)
+    
     crisis_name: str
     crisis_type: str
     start_date: str
@@ -55,6 +70,8 @@ class CrisisAnalysisResponse(BaseModel):
 
 class RollingAnalysisResponse(BaseModel):
     """Rolling period analysis results for API response"""
+    model_config = ConfigDict(from_attributes=True)
+    
     period_years: int
     periods_analyzed: int
     avg_cagr: float
@@ -69,6 +86,8 @@ class RollingAnalysisResponse(BaseModel):
 
 class EnhancedRiskMetricsResponse(BaseModel):
     """Enhanced risk metrics for API response"""
+    model_config = ConfigDict(from_attributes=True)
+    
     var_95: float
     cvar_95: float
     sortino_ratio: float
@@ -81,6 +100,8 @@ class EnhancedRiskMetricsResponse(BaseModel):
 
 class EnhancedPortfolioResponse(BaseModel):
     """Enhanced portfolio optimization response"""
+    model_config = ConfigDict(from_attributes=True)
+    
     strategy: str
     allocation: Dict[str, float]
     expected_return: float
@@ -126,51 +147,17 @@ async def optimize_enhanced_portfolio(request: EnhancedOptimizationRequest):
             max_annual_contribution=request.max_annual_contribution
         )
         
-        # Get enhanced optimization results
-        results = enhanced_optimizer.optimize_enhanced_portfolio(portfolio_request)
+        # Get enhanced optimization results (CPU-heavy, so run off the event loop)
+        results = await asyncio.to_thread(_run_enhanced_optimization, portfolio_request)
         
-        # Convert internal results to API response format
-        api_results = []
-        for result in results:
-            # Convert crisis analysis
-            crisis_analysis = [
-                CrisisAnalysisResponse(**crisis.__dict__)
-                for crisis in result.crisis_analysis
-            ]
-            
-            # Convert rolling analysis
-            rolling_analysis = {
-                period: RollingAnalysisResponse(**analysis.__dict__)
-                for period, analysis in result.rolling_analysis.items()
-            }
-            
-            # Convert risk metrics
-            risk_metrics = EnhancedRiskMetricsResponse(**result.risk_metrics.__dict__)
-            
-            api_result = EnhancedPortfolioResponse(
-                strategy=result.strategy,
-                allocation=result.allocation,
-                expected_return=result.expected_return,
-                volatility=result.volatility,
-                sharpe_ratio=result.sharpe_ratio,
-                target_achievement_probability=result.target_achievement_probability,
-                expected_final_value=result.expected_final_value,
-                crisis_analysis=crisis_analysis,
-                overall_crisis_score=result.overall_crisis_score,
-                rolling_analysis=rolling_analysis,
-                consistency_score=result.consistency_score,
-                risk_metrics=risk_metrics,
-                avg_recovery_time_months=result.avg_recovery_time_months,
-                worst_drawdown_recovery_months=result.worst_drawdown_recovery_months,
-                optimal_rebalancing_frequency=result.optimal_rebalancing_frequency,
-                rebalancing_benefit=result.rebalancing_benefit,
-                account_specific_notes=result.account_specific_notes
-            )
-            
-            api_results.append(api_result)
+        # The response models mirror the result dataclasses field for field, so
+        # validate straight from their attributes instead of copying each __dict__
+        api_results = [EnhancedPortfolioResponse.model_validate(result) for result in results]
         
         logger.info(f"Successfully generated {len(api_results)} enhanced portfolios")
-        return api_results
+        # Already validated above; serialize straight to orjson rather than having
+        # FastAPI re-validate the list against response_model
+        return ORJSONResponse([api_result.model_dump() for api_result in api_results])
         
     except ValueError as e:
         logger.error(f"Validation error in enhanced optimization: {str(e)}")
@@ -179,79 +166,88 @@ async def optimize_enhanced_portfolio(request: EnhancedOptimizationRequest):
         logger.error(f"Error in enhanced portfolio optimization: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error during optimization")
 
+# Static payloads, serialized once at import so requests skip JSON encoding entirely
+ANALYTICS_INFO = {
+    "crisis_periods": [
+        {
+            "name": "2008 Financial Crisis",
+            "type": "financial_crisis",
+            "start_date": "2007-10-09",
+            "end_date": "2009-03-09",
+            "market_decline": -56.8,
+            "description": "Global financial crisis and recession"
+        },
+        {
+            "name": "2020 COVID Pandemic", 
+            "type": "pandemic",
+            "start_date": "2020-02-19",
+            "end_date": "2020-03-23",
+            "market_decline": -33.9,
+            "description": "COVID-19 pandemic market crash"
+        },
+        {
+            "name": "2022 Bear Market",
+            "type": "bear_market", 
+            "start_date": "2022-01-03",
+            "end_date": "2022-10-12",
+            "market_decline": -25.4,
+            "description": "Inflation and rate hike bear market"
+        }
+    ],
+    "rolling_periods": ["3yr", "5yr", "10yr"],
+    "risk_metrics": [
+        "Value at Risk (95%)",
+        "Conditional Value at Risk (95%)",
+        "Sortino Ratio",
+        "Calmar Ratio", 
+        "Maximum Monthly Loss",
+        "Worst 12-Month Return",
+        "Downside Volatility",
+        "Upside/Downside Capture"
+    ],
+    "account_types": ["taxable", "tax_deferred", "tax_free"]
+}
+
+_ANALYTICS_INFO_PAYLOAD = StaticJSONPayload(ANALYTICS_INFO)
+
 @router.get("/portfolio/analytics-info")
-async def get_analytics_info():
+async def get_analytics_info(request: Request):
     """
     Get information about available analytics and crisis periods
     """
-    return {
-        "crisis_periods": [
-            {
-                "name": "2008 Financial Crisis",
-                "type": "financial_crisis",
-                "start_date": "2007-10-09",
-                "end_date": "2009-03-09",
-                "market_decline": -56.8,
-                "description": "Global financial crisis and recession"
-            },
-            {
-                "name": "2020 COVID Pandemic", 
-                "type": "pandemic",
-                "start_date": "2020-02-19",
-                "end_date": "2020-03-23",
-                "market_decline": -33.9,
-                "description": "COVID-19 pandemic market crash"
-            },
-            {
-                "name": "2022 Bear Market",
-                "type": "bear_market", 
-                "start_date": "2022-01-03",
-                "end_date": "2022-10-12",
-                "market_decline": -25.4,
-                "description": "Inflation and rate hike bear market"
-            }
-        ],
-        "rolling_periods": ["3yr", "5yr", "10yr"],
-        "risk_metrics": [
-            "Value at Risk (95%)",
-            "Conditional Value at Risk (95%)",
-            "Sortino Ratio",
-            "Calmar Ratio", 
-            "Maximum Monthly Loss",
-            "Worst 12-Month Return",
-            "Downside Volatility",
-            "Upside/Downside Capture"
-        ],
-        "account_types": ["taxable", "tax_deferred", "tax_free"]
-    }
+    return _ANALYTICS_INFO_PAYLOAD.response(request)
+
+ASSET_UNIVERSE = {
+    "assets": [
+        {"symbol": "VTI", "name": "Total Stock Market", "category": "US Equity"},
+        {"symbol": "VTIAX", "name": "Total International Stock", "category": "International Equity"},
+        {"symbol": "BND", "name": "Total Bond Market", "category": "Bonds"},
+        {"symbol": "VNQ", "name": "Real Estate", "category": "REITs"},
+        {"symbol": "GLD", "name": "Gold", "category": "Commodities"},
+        {"symbol": "VWO", "name": "Emerging Markets", "category": "Emerging Markets"},
+        {"symbol": "QQQ", "name": "Technology Growth", "category": "Technology"}
+    ],
+    "data_range": {
+        "start_date": "2004-01-01",
+        "end_date": "2024-12-31",
+        "total_records": "33,725+"
+    },
+    "optimization_features": [
+        "Three-strategy optimization (Conservative/Balanced/Aggressive)",
+        "Crisis period stress testing",
+        "Rolling period consistency analysis",
+        "Advanced risk metrics (VaR, CVaR, Sortino, etc.)",
+        "Recovery time analysis",
+        "Account type optimization",
+        "Monte Carlo projections"
+    ]
+}
+
+_ASSET_UNIVERSE_PAYLOAD = StaticJSONPayload(ASSET_UNIVERSE)
 
 @router.get("/portfolio/asset-universe")
-async def get_asset_universe():
+async def get_asset_universe(request: Request):
     """
     Get information about the 7-asset universe used for optimization
     """
-    return {
-        "assets": [
-            {"symbol": "VTI", "name": "Total Stock Market", "category": "US Equity"},
-            {"symbol": "VTIAX", "name": "Total International Stock", "category": "International Equity"},
-            {"symbol": "BND", "name": "Total Bond Market", "category": "Bonds"},
-            {"symbol": "VNQ", "name": "Real Estate", "category": "REITs"},
-            {"symbol": "GLD", "name": "Gold", "category": "Commodities"},
-            {"symbol": "VWO", "name": "Emerging Markets", "category": "Emerging Markets"},
-            {"symbol": "QQQ", "name": "Technology Growth", "category": "Technology"}
-        ],
-        "data_range": {
-            "start_date": "2004-01-01",
-            "end_date": "2024-12-31",
-            "total_records": "33,725+"
-        },
-        "optimization_features": [
-            "Three-strategy optimization (Conservative/Balanced/Aggressive)",
-            "Crisis period stress testing",
-            "Rolling period consistency analysis",
-            "Advanced risk metrics (VaR, CVaR, Sortino, etc.)",
-            "Recovery time analysis",
-            "Account type optimization",
-            "Monte Carlo projections"
-        ]
-    }
+    return _ASSET_UNIVERSE_PAYLOAD.response(request)
@@ -0,0 +1,99 @@
+"""
+HTTP caching helpers for endpoints that serve constant JSON payloads and static files
+"""
+import gzip
+import hashlib
+from typing import Any, Optional
+
+import orjson
+from fastapi import HTTPException, Request, Response
+
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+# UI pages change with each deploy, so browsers revalidate them (a cheap 304)
+# rather than keeping a stale page for an hour
+HTML_CACHE_CONTROL = "no-cache"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header covers the given ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 8.8.3.2): W/ prefixes are ignored on both sides
+    etag = etag.removeprefix("W/")
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class StaticJSONPayload:
+    """A constant JSON body serialized once, with a strong ETag for conditional GETs"""
+
+    def __init__(self, content: Any, cache_control: str = STATIC_CACHE_CONTROL):
+        self.body = orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:16]}"'
+        self.headers = {"ETag": self.etag, "Cache-Control": cache_control}
+
+    def response(self, request: Request) -> Response:
+        """Return 304 Not Modified when the client already holds this payload"""
+        if etag_matches(request, self.etag):
+            return Response(status_code=304, headers=self.headers)
+        return Response(content=self.body, media_type="application/json", headers=self.headers)
+
+
+def accepts_gzip(request: Request) -> bool:
+    """Whether Accept-Encoding allows gzip, honouring q-values (gzip;q=0 refuses it)"""
+    qvalues = {}
+    for item in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        name, _, value = params.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+        qvalues[coding] = q
+    return qvalues.get("gzip", qvalues.get("*", 0.0)) > 0
+
+
+class StaticFile:
+    """A file that doesn't change while the app runs, read and gzipped once at import
+
+    The plain and gzipped bodies are separate representations, each with its own ETag.
+    """
+
+    def __init__(self, path: str, media_type: str = "text/html", cache_control: str = HTML_CACHE_CONTROL):
+        self.path = path
+        self.media_type = media_type
+        self.body: Optional[bytes] = None
+        self.gzipped: Optional[bytes] = None
+        headers = {"Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        try:
+            with open(path, "rb") as f:
+                self.body = f.read()
+        except OSError:
+            return  # Missing files 404 at request time
+        self.gzipped = gzip.compress(self.body)
+        digest = hashlib.sha256(self.body).hexdigest()[:16]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+        self.headers = {**headers, "ETag": self.etag}
+        self.gzip_headers = {**headers, "ETag": self.gzip_etag, "Content-Encoding": "gzip"}
+
+    def response(self, request: Request) -> Response:
+        """Serve the cached bytes, gzipped when accepted, or 304 when the client has them"""
+        if self.body is None:
+            raise HTTPException(status_code=404, detail="Not Found")
+        if accepts_gzip(request):
+            content, headers = self.gzipped, self.gzip_headers
+        else:
+            content, headers = self.body, self.headers
+        if etag_matches(request, headers["ETag"]):
+            # A 304 carries no body, so it must not claim a Content-Encoding
+            return Response(status_code=304, headers={k: v for k, v in headers.items() if k != "Content-Encoding"})
+        return Response(content=content, media_type=self.media_type, headers=headers)
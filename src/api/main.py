@@ -1,29 +1,33 @@
 """
 FastAPI application for Portfolio Backtesting PoC
 """
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 import logging
+import time
 from typing import Dict, Any
 import os
 
-from src.models.database import SessionLocal, engine, get_db
+from src.models.database import SessionLocal, engine, get_db, async_session, dispose_async_engine
 from src.models import schemas
 from src.core.portfolio_engine_optimized import OptimizedPortfolioEngine as PortfolioEngine
 from src.core.data_manager import DataManager
 from src.api.backtesting import router as backtesting_router
-from src.api.data_routes import router as data_router
+from src.api.data_routes import router as data_router, preload_assets
 from src.api.optimization_routes import router as optimization_router
 from src.api.optimization_routes_v2 import router as optimization_v2_router
-from src.api.claude_routes import router as claude_router
+from src.api.claude_routes import router as claude_router, start_http_client, close_http_client
 from src.api.analysis_routes import router as analysis_router
 from src.api.rebalancing_routes import router as rebalancing_router
 from src.api.enhanced_optimization_routes import router as enhanced_optimization_router
 from src.api.walk_forward_routes import router as walk_forward_router
 from src.api.regime_routes import router as regime_router
+from src.api.clock import now_iso, start_clock, stop_clock
+from src.api.http_cache import StaticFile, etag_matches
 
 # Configure logging
 logging.basicConfig(
@@ -38,7 +42,8 @@ app = FastAPI(
     description="AI-powered portfolio optimization and backtesting system",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -62,6 +67,30 @@ app.include_router(analysis_router)
 app.include_router(rebalancing_router)
 app.include_router(regime_router)
 
+@app.on_event("startup")
+async def start_background_clock():
+    start_clock()
+
+@app.on_event("shutdown")
+async def stop_background_clock():
+    await stop_clock()
+
+@app.on_event("startup")
+async def open_analysis_client():
+    start_http_client()
+
+@app.on_event("shutdown")
+async def close_analysis_client():
+    await close_http_client()
+
+@app.on_event("startup")
+async def preload_asset_cache():
+    await preload_assets()
+
+@app.on_event("shutdown")
+async def close_async_db():
+    await dispose_async_engine()
+
 # Add direct route alias for frontend compatibility
 from src.api.optimization_routes_v2 import optimize_portfolio as optimize_portfolio_v2
 from src.api.optimization_routes_v2 import OptimizationRequestAPI
@@ -74,84 +103,99 @@ async def optimize_portfolio_alias(request: OptimizationRequestAPI, db: Session
 # Mount static files for web UI
 app.mount("/static", StaticFiles(directory="web"), name="static")
 
+# UI pages, held in memory (plain and gzipped) and revalidated by ETag
+_INDEX_PAGE = StaticFile("web/index.html")
+_PORTFOLIO_OPTIMIZER_ENHANCED_PAGE = StaticFile("web/portfolio-optimizer-enhanced.html")
+_PORTFOLIO_OPTIMIZER_PAGE = StaticFile("web/portfolio-optimizer.html")
+_DASHBOARD_PAGE = StaticFile("web/dashboard.html")
+_API_PIE_TEST_PAGE = StaticFile("web/api_pie_test.html")
+_PORTFOLIO_OPTIMIZER_SIMPLE_PAGE = StaticFile("web/portfolio-optimizer-simple.html")
+_CHARTJS_TEST_PAGE = StaticFile("web/chartjs_test.html")
+_PIE_CHART_TEST_PAGE = StaticFile("web/pie_chart_test.html")
+_CDN_TEST_PAGE = StaticFile("web/cdn_test.html")
+_REBALANCING_ANALYZER_PAGE = StaticFile("web/rebalancing-analyzer.html")
+_WALK_FORWARD_ANALYZER_PAGE = StaticFile("web/walk-forward-analyzer.html")
+_REGIME_ANALYZER_PAGE = StaticFile("web/regime-analyzer.html")
+_GUIDED_DASHBOARD_PAGE = StaticFile("web/guided-dashboard.html")
+
 @app.get("/chat")
-async def serve_chat_ui():
+async def serve_chat_ui(request: Request):
     """Serve the Claude portfolio chat UI"""
-    return FileResponse("web/index.html")
+    return _INDEX_PAGE.response(request)
 
 @app.get("/portfolio-optimizer-enhanced.html")
-async def serve_enhanced_optimizer():
+async def serve_enhanced_optimizer(request: Request):
     """Serve the enhanced portfolio optimizer UI"""
-    return FileResponse("web/portfolio-optimizer-enhanced.html")
+    return _PORTFOLIO_OPTIMIZER_ENHANCED_PAGE.response(request)
 
 @app.get("/portfolio-optimizer.html")
-async def serve_basic_optimizer():
+async def serve_basic_optimizer(request: Request):
     """Serve the basic portfolio optimizer UI"""
-    return FileResponse("web/portfolio-optimizer.html")
+    return _PORTFOLIO_OPTIMIZER_PAGE.response(request)
 
 @app.get("/dashboard.html")
-async def serve_dashboard():
+async def serve_dashboard(request: Request):
     """Serve the dashboard UI"""
-    return FileResponse("web/dashboard.html")
+    return _DASHBOARD_PAGE.response(request)
 
 @app.get("/api_pie_test.html")
-async def serve_api_pie_test():
+async def serve_api_pie_test(request: Request):
     """Serve the API pie chart test UI"""
-    return FileResponse("web/api_pie_test.html")
+    return _API_PIE_TEST_PAGE.response(request)
 
 @app.get("/portfolio-optimizer-simple.html")
-async def serve_simple_optimizer():
+async def serve_simple_optimizer(request: Request):
     """Serve the simple portfolio optimizer with working pie charts"""
-    return FileResponse("web/portfolio-optimizer-simple.html")
+    return _PORTFOLIO_OPTIMIZER_SIMPLE_PAGE.response(request)
 
 @app.get("/chartjs_test.html")
-async def serve_chartjs_test():
+async def serve_chartjs_test(request: Request):
     """Serve the Chart.js test page"""
-    return FileResponse("web/chartjs_test.html")
+    return _CHARTJS_TEST_PAGE.response(request)
 
 @app.get("/pie_chart_test.html")
-async def serve_pie_chart_test():
+async def serve_pie_chart_test(request: Request):
     """Serve the pie chart test with hardcoded data"""
-    return FileResponse("web/pie_chart_test.html")
+    return _PIE_CHART_TEST_PAGE.response(request)
 
 @app.get("/cdn_test.html")
-async def serve_cdn_test():
+async def serve_cdn_test(request: Request):
     """Serve the CDN Chart.js test"""
-    return FileResponse("web/cdn_test.html")
+    return _CDN_TEST_PAGE.response(request)
 
 @app.get("/rebalancing-analyzer.html")
-async def serve_rebalancing_analyzer():
+async def serve_rebalancing_analyzer(request: Request):
     """Serve the rebalancing strategy analyzer UI"""
-    return FileResponse("web/rebalancing-analyzer.html")
+    return _REBALANCING_ANALYZER_PAGE.response(request)
 
 @app.get("/walk-forward-analyzer.html")
-async def serve_walk_forward_analyzer():
+async def serve_walk_forward_analyzer(request: Request):
     """Serve the walk-forward validation analyzer UI"""
-    return FileResponse("web/walk-forward-analyzer.html")
+    return _WALK_FORWARD_ANALYZER_PAGE.response(request)
 
 @app.get("/regime-analyzer.html")
-async def serve_regime_analyzer():
+async def serve_regime_analyzer(request: Request):
     """Serve the market regime analyzer UI"""
-    return FileResponse("web/regime-analyzer.html")
+    return _REGIME_ANALYZER_PAGE.response(request)
 
 @app.get("/guided-dashboard.html")
-async def serve_guided_dashboard():
+async def serve_guided_dashboard(request: Request):
     """Serve the guided portfolio analysis dashboard UI"""
-    return FileResponse("web/guided-dashboard.html")
+    return _GUIDED_DASHBOARD_PAGE.response(request)
 
 
 
 # Database dependency - removed since it's now imported from database.py
 
 @app.get("/")
-async def serve_index():
+async def serve_index(request: Request):
     """Serve the main index page"""
-    return FileResponse("web/index.html")
+    return _INDEX_PAGE.response(request)
 
 @app.get("/index.html")
-async def serve_index_html():
+async def serve_index_html(request: Request):
     """Serve the main index page with .html extension"""
-    return FileResponse("web/index.html")
+    return _INDEX_PAGE.response(request)
 
 @app.get("/api/health")
 async def api_health():
@@ -162,23 +206,40 @@ async def api_health():
         "status": "healthy"
     }
 
+# Database connectivity is re-checked at most once per HEALTH_CHECK_INTERVAL_SECONDS;
+# probes in between reuse the last result
+HEALTH_CHECK_INTERVAL_SECONDS = 1.0
+_HEALTH = {"checked_at": float("-inf"), "database": None}
+
 @app.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(request: Request):
     """Comprehensive health check including database connectivity"""
-    try:
-        # Test database connection
-        from sqlalchemy import text
-        db.execute(text("SELECT 1"))
-        db_status = "connected"
-    except Exception as e:
-        logger.error(f"Database health check failed: {e}")
-        db_status = "disconnected"
-        
-    return {
-        "status": "healthy" if db_status == "connected" else "unhealthy",
+    if time.monotonic() - _HEALTH["checked_at"] >= HEALTH_CHECK_INTERVAL_SECONDS:
+        try:
+            # Test database connection without blocking the event loop
+            async with async_session() as db:
+                await db.execute(text("SELECT 1"))
+            db_status = "connected"
+        except Exception as e:
+            logger.error(f"Database health check failed: {e}")
+            db_status = "disconnected"
+        _HEALTH.update(checked_at=time.monotonic(), database=db_status)
+    
+    db_status = _HEALTH["database"]
+    status = "healthy" if db_status == "connected" else "unhealthy"
+    
+    # Weak ETag over the status fields; the timestamp alone changing isn't a new state
+    # Monitors must revalidate each time (no-cache), but a match costs no body
+    etag = f'W/"{status}-{db_status}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    return ORJSONResponse({
+        "status": status,
         "database": db_status,
-        "timestamp": "2025-08-27T00:00:00Z"  # In production, use actual timestamp
-    }
+        "timestamp": now_iso()
+    }, headers=headers)
 
 if __name__ == "__main__":
     import uvicorn
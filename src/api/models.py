@@ -1,11 +1,20 @@
 """
 Pydantic models for API requests and responses
 """
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Dict, List, Optional, Any
+from math import fsum
 import datetime
 from decimal import Decimal
 
+# Asset universe accepted by the backtest endpoints
+VALID_SYMBOLS = frozenset({
+    # Original 3-asset universe
+    'VTI', 'VTIAX', 'BND',
+    # Expanded 4 new assets
+    'VNQ', 'GLD', 'VWO', 'QQQ'
+})
+
 class PortfolioAllocation(BaseModel):
     """Portfolio allocation model with validation for 3-asset and 7-asset portfolios"""
     allocation: Dict[str, float] = Field(
@@ -14,36 +23,42 @@ class PortfolioAllocation(BaseModel):
         example={"VTI": 0.6, "VTIAX": 0.3, "BND": 0.1}
     )
     
-    @validator('allocation')
+    # Allocations are never modified after parsing
+    model_config = ConfigDict(frozen=True)
+    
+    @field_validator('allocation')
+    @classmethod
     def validate_allocation(cls, v):
         if not v:
             raise ValueError("Allocation cannot be empty")
-            
+        
+        # Gather everything in one pass - this runs on every backtest request -
+        # then report problems in the usual order: sum, sign, symbols
+        weights = []
+        has_negative = False
+        invalid_symbols = set()
+        for symbol, weight in v.items():
+            weights.append(weight)
+            if weight < 0:
+                has_negative = True
+            if symbol not in VALID_SYMBOLS:
+                invalid_symbols.add(symbol)
+        
         # Check if weights sum to 1.0 (with small tolerance for floating point)
-        total = sum(v.values())
+        total = fsum(weights)
         if abs(total - 1.0) > 0.0001:
             raise ValueError(f"Allocation weights must sum to 1.0, got {total:.6f}")
             
         # Check for negative weights
-        if any(weight < 0 for weight in v.values()):
+        if has_negative:
             raise ValueError("Allocation weights cannot be negative")
             
         # Validate asset symbols - support both 3-asset and 7-asset portfolios
-        valid_symbols = {
-            # Original 3-asset universe
-            'VTI', 'VTIAX', 'BND',
-            # Expanded 4 new assets  
-            'VNQ', 'GLD', 'VWO', 'QQQ'
-        }
-        
-        provided_symbols = set(v.keys())
-        invalid_symbols = provided_symbols - valid_symbols
-        
         if invalid_symbols:
-            raise ValueError(f"Invalid asset symbols: {invalid_symbols}. Valid symbols: {sorted(valid_symbols)}")
+            raise ValueError(f"Invalid asset symbols: {invalid_symbols}. Valid symbols: {sorted(VALID_SYMBOLS)}")
         
         # Allow 3-asset (legacy) or 7-asset allocations, but enforce minimum diversity
-        if len(provided_symbols) < 2:
+        if len(v) < 2:
             raise ValueError("Portfolio must contain at least 2 assets for diversification")
             
         return v
@@ -65,7 +80,10 @@ class SevenAssetPortfolioAllocation(BaseModel):
         }
     )
     
-    @validator('allocation')
+    model_config = ConfigDict(frozen=True)
+    
+    @field_validator('allocation')
+    @classmethod
     def validate_7_asset_allocation(cls, v):
         # Reuse the same validation as PortfolioAllocation
         return PortfolioAllocation.validate_allocation(v)
@@ -91,7 +109,8 @@ class BacktestRequest(BaseModel):
     end_date: str = Field("2024-12-31", description="Backtest end date (YYYY-MM-DD)")
     rebalance_frequency: str = Field("monthly", description="Rebalancing frequency")
     
-    @validator('start_date', 'end_date')
+    @field_validator('start_date', 'end_date')
+    @classmethod
     def validate_dates(cls, v):
         try:
             datetime.datetime.strptime(v, '%Y-%m-%d')
@@ -99,7 +118,8 @@ class BacktestRequest(BaseModel):
             raise ValueError(f"Date must be in YYYY-MM-DD format, got: {v}")
         return v
     
-    @validator('rebalance_frequency')
+    @field_validator('rebalance_frequency')
+    @classmethod
     def validate_rebalance_frequency(cls, v):
         valid_frequencies = ['daily', 'monthly', 'quarterly', 'annually']
         if v not in valid_frequencies:
@@ -115,7 +135,8 @@ class SevenAssetBacktestRequest(BaseModel):
     end_date: str = Field("2024-12-31", description="End date")
     rebalance_frequency: str = Field("quarterly", description="Quarterly rebalancing for tax efficiency")
     
-    @validator('start_date', 'end_date')
+    @field_validator('start_date', 'end_date')
+    @classmethod
     def validate_dates(cls, v):
         try:
             datetime.datetime.strptime(v, '%Y-%m-%d')
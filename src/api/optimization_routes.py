@@ -94,7 +94,7 @@ async def calculate_efficient_frontier(
     allowing users to choose their preferred risk/return tradeoff.
     """
     import time
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         logger.info(f"Calculating efficient frontier for assets: {request.assets}")
@@ -137,7 +137,7 @@ async def calculate_efficient_frontier(
             for k, v in result['correlation_matrix'].items()
         }
         
-        calculation_time = time.time() - start_time
+        calculation_time = time.perf_counter() - start_time
         logger.info(f"Efficient frontier calculated in {calculation_time:.2f} seconds")
         
         return EfficientFrontierResponse(
@@ -177,7 +177,7 @@ async def find_max_sharpe_portfolio(
     according to the Sharpe ratio metric.
     """
     import time
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         logger.info(f"Finding max Sharpe portfolio for assets: {request.assets}")
@@ -200,7 +200,7 @@ async def find_max_sharpe_portfolio(
             constraints=constraints_dict
         )
         
-        calculation_time = time.time() - start_time
+        calculation_time = time.perf_counter() - start_time
         logger.info(f"Max Sharpe portfolio found in {calculation_time:.2f} seconds")
         
         # Convert numpy types to Python types for JSON serialization
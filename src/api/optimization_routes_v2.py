@@ -8,13 +8,14 @@ Enhanced portfolio optimization endpoints providing:
 - New money vs traditional rebalancing comparison
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional, Any
 from pydantic import BaseModel, Field, validator
 import logging
 
 from ..models.database import get_db
+from .http_cache import StaticJSONPayload
 from ..optimization.portfolio_optimizer import (
     PortfolioOptimizer, PortfolioRequest, AccountType, StrategyType
 )
@@ -158,45 +159,50 @@ async def optimize_portfolio(
             detail=f"Portfolio optimization failed: {str(e)}"
         )
 
+# Static payloads, serialized once at import so requests skip JSON encoding entirely
+OPTIMIZATION_STRATEGIES = {
+    "strategies": [
+        {
+            "name": "conservative",
+            "description": "Global Minimum Variance with bond tilt - lowest risk",
+            "typical_volatility": "8-12%",
+            "typical_return": "6-8%"
+        },
+        {
+            "name": "balanced", 
+            "description": "Maximum Sharpe ratio with moderate constraints",
+            "typical_volatility": "12-16%",
+            "typical_return": "8-10%"
+        },
+        {
+            "name": "aggressive",
+            "description": "Maximum Sharpe ratio with growth tilt - higher returns",
+            "typical_volatility": "16-22%", 
+            "typical_return": "10-12%"
+        }
+    ],
+    "account_types": [
+        {
+            "type": "taxable",
+            "description": "Regular brokerage account - subject to capital gains tax"
+        },
+        {
+            "type": "tax_deferred", 
+            "description": "401k, Traditional IRA - tax-deferred growth"
+        },
+        {
+            "type": "tax_free",
+            "description": "Roth IRA, HSA - tax-free growth and withdrawals"
+        }
+    ]
+}
+
+_STRATEGIES_PAYLOAD = StaticJSONPayload(OPTIMIZATION_STRATEGIES)
+
 @router.get("/strategies")  
-async def get_available_strategies():
+async def get_available_strategies(request: Request):
     """Get list of available optimization strategies"""
-    return {
-        "strategies": [
-            {
-                "name": "conservative",
-                "description": "Global Minimum Variance with bond tilt - lowest risk",
-                "typical_volatility": "8-12%",
-                "typical_return": "6-8%"
-            },
-            {
-                "name": "balanced", 
-                "description": "Maximum Sharpe ratio with moderate constraints",
-                "typical_volatility": "12-16%",
-                "typical_return": "8-10%"
-            },
-            {
-                "name": "aggressive",
-                "description": "Maximum Sharpe ratio with growth tilt - higher returns",
-                "typical_volatility": "16-22%", 
-                "typical_return": "10-12%"
-            }
-        ],
-        "account_types": [
-            {
-                "type": "taxable",
-                "description": "Regular brokerage account - subject to capital gains tax"
-            },
-            {
-                "type": "tax_deferred", 
-                "description": "401k, Traditional IRA - tax-deferred growth"
-            },
-            {
-                "type": "tax_free",
-                "description": "Roth IRA, HSA - tax-free growth and withdrawals"
-            }
-        ]
-    }
+    return _STRATEGIES_PAYLOAD.response(request)
 
 @router.post("/compare-rebalancing")
 async def compare_rebalancing_strategies(
@@ -245,30 +251,34 @@ async def compare_rebalancing_strategies(
             detail=f"Rebalancing comparison failed: {str(e)}"
         )
 
+ASSET_UNIVERSE = {
+    "assets": [
+        {"symbol": "VTI", "name": "Vanguard Total Stock Market ETF", "class": "US Total Market"},
+        {"symbol": "VTIAX", "name": "Vanguard Total International Stock Index", "class": "International Developed"},  
+        {"symbol": "BND", "name": "Vanguard Total Bond Market ETF", "class": "US Bonds"},
+        {"symbol": "VNQ", "name": "Vanguard Real Estate ETF", "class": "REITs"},
+        {"symbol": "GLD", "name": "SPDR Gold Trust", "class": "Gold/Commodities"},
+        {"symbol": "VWO", "name": "Vanguard Emerging Markets ETF", "class": "Emerging Markets"},
+        {"symbol": "QQQ", "name": "Invesco QQQ Trust", "class": "Technology/Growth"}
+    ],
+    "data_availability": {
+        "start_date": "2004-01-01",
+        "end_date": "2024-12-31", 
+        "total_years": 20,
+        "total_records": 33725
+    },
+    "optimization_features": [
+        "20-year historical performance analysis",
+        "Crisis period stress testing (2008, 2020, 2022)",
+        "Rolling period consistency analysis",
+        "Correlation evolution over time",
+        "Rebalancing strategy optimization"
+    ]
+}
+
+_ASSET_UNIVERSE_PAYLOAD = StaticJSONPayload(ASSET_UNIVERSE)
+
 @router.get("/asset-universe")
-async def get_asset_universe():
+async def get_asset_universe(request: Request):
     """Get information about the 7-asset universe"""
-    return {
-        "assets": [
-            {"symbol": "VTI", "name": "Vanguard Total Stock Market ETF", "class": "US Total Market"},
-            {"symbol": "VTIAX", "name": "Vanguard Total International Stock Index", "class": "International Developed"},  
-            {"symbol": "BND", "name": "Vanguard Total Bond Market ETF", "class": "US Bonds"},
-            {"symbol": "VNQ", "name": "Vanguard Real Estate ETF", "class": "REITs"},
-            {"symbol": "GLD", "name": "SPDR Gold Trust", "class": "Gold/Commodities"},
-            {"symbol": "VWO", "name": "Vanguard Emerging Markets ETF", "class": "Emerging Markets"},
-            {"symbol": "QQQ", "name": "Invesco QQQ Trust", "class": "Technology/Growth"}
-        ],
-        "data_availability": {
-            "start_date": "2004-01-01",
-            "end_date": "2024-12-31", 
-            "total_years": 20,
-            "total_records": 33725
-        },
-        "optimization_features": [
-            "20-year historical performance analysis",
-            "Crisis period stress testing (2008, 2020, 2022)",
-            "Rolling period consistency analysis",
-            "Correlation evolution over time",
-            "Rebalancing strategy optimization"
-        ]
-    }
+    return _ASSET_UNIVERSE_PAYLOAD.response(request)
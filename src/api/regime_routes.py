@@ -14,6 +14,7 @@ import pandas as pd
 from ..regime.regime_detector import MarketRegimeDetector
 from ..regime.regime_analyzer import RegimeAwareAnalyzer
 from ..models.base import DatabaseManager
+from .clock import now_iso
 
 logger = logging.getLogger(__name__)
 
@@ -511,7 +512,7 @@ async def regime_health_check():
             'recent_data_points': data_count,
             'supported_assets': ['VTI', 'VTIAX', 'BND', 'VNQ', 'GLD', 'VWO', 'QQQ'],
             'regime_types_available': len(regime_detector.regime_types),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
         
         logger.info("Regime analysis health check passed")
@@ -16,6 +16,7 @@ from ..backtesting.walk_forward_validator import WalkForwardValidator, Validatio
 from ..optimization.portfolio_optimizer_enhanced import EnhancedPortfolioOptimizer
 from ..core.data_manager import DataManager
 from ..models.database import get_db
+from .clock import now_iso
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -132,7 +133,7 @@ async def get_status():
             "status": "operational",
             "available_symbols": len(test_data),
             "validator_ready": True,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
     except Exception as e:
         logger.error(f"Status check failed: {str(e)}")
@@ -2,7 +2,9 @@
 Database configuration and connection setup
 """
 import os
+from typing import Optional
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
@@ -13,8 +15,78 @@ load_dotenv()
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://postgres@localhost/backtesting")
 
-# Create database engines (sync only for now)
-engine = create_engine(DATABASE_URL)
+# Async drivers for URLs that name the default sync driver
+ASYNC_DRIVERS = {
+    "postgresql://": "postgresql+asyncpg://",
+    "postgresql+psycopg2://": "postgresql+asyncpg://",
+    "postgresql+psycopg://": "postgresql+asyncpg://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
+
+def to_async_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its async driver"""
+    for prefix, async_prefix in ASYNC_DRIVERS.items():
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+# Connection pool sizing. Backtests hold a session for the whole engine run in a
+# worker thread, so the sync pool covers asyncio's default thread pool (at most 32
+# threads). The async pool only serves short reads (/health, /api/data), so it
+# stays small. Both pools count against DB_MAX_CONNECTIONS_PER_PROCESS, which should
+# be sized so that workers x budget stays under the server's max_connections
+# (Postgres defaults to 100).
+DB_MAX_CONNECTIONS_PER_PROCESS = int(os.getenv("DB_MAX_CONNECTIONS_PER_PROCESS", "45"))
+POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+POOL_SETTINGS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "12")),
+    "pool_recycle": POOL_RECYCLE_SECONDS,
+    "pool_pre_ping": True,
+}
+ASYNC_POOL_SETTINGS = {
+    "pool_size": int(os.getenv("DB_ASYNC_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_ASYNC_MAX_OVERFLOW", "5")),
+    "pool_recycle": POOL_RECYCLE_SECONDS,
+    "pool_pre_ping": True,
+}
+
+def max_connections(settings: dict) -> int:
+    """Most connections a pool with these settings can open"""
+    return settings["pool_size"] + settings["max_overflow"]
+
+def check_pool_budget():
+    """Refuse to start with pools that could open more than the per-process budget"""
+    total = max_connections(POOL_SETTINGS) + max_connections(ASYNC_POOL_SETTINGS)
+    if total > DB_MAX_CONNECTIONS_PER_PROCESS:
+        raise ValueError(
+            f"DB pools allow {max_connections(POOL_SETTINGS)} sync + "
+            f"{max_connections(ASYNC_POOL_SETTINGS)} async connections, over "
+            f"DB_MAX_CONNECTIONS_PER_PROCESS={DB_MAX_CONNECTIONS_PER_PROCESS}"
+        )
+
+check_pool_budget()
+
+# Create database engines (the backtest engines stay sync and run in worker threads)
+engine = create_engine(DATABASE_URL, **POOL_SETTINGS)
+_async_engine: Optional[AsyncEngine] = None
+_AsyncSessionLocal: Optional[async_sessionmaker] = None
+
+def get_async_engine() -> AsyncEngine:
+    """Async engine, created on first use so the async driver is only needed when used"""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        _async_engine = create_async_engine(to_async_url(DATABASE_URL), **ASYNC_POOL_SETTINGS)
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, expire_on_commit=False)
+    return _async_engine
+
+async def dispose_async_engine():
+    """Close pooled async connections (call from the app shutdown event)"""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _AsyncSessionLocal = None
 
 # Create session makers
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -29,3 +101,13 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def async_session() -> AsyncSession:
+    """New async session, for work that outlives a request dependency (e.g. streaming)"""
+    get_async_engine()
+    return _AsyncSessionLocal()
+
+# Dependency to get an async database session
+async def get_async_db():
+    async with async_session() as db:
+        yield db
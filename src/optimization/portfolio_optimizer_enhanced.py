@@ -21,6 +21,7 @@ from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
 
 # Import existing system components
@@ -193,17 +194,23 @@ class EnhancedPortfolioOptimizer:
             # Get base optimization results
             base_optimization = self.base_optimizer.optimize_portfolio(request)
             
-            enhanced_results = []
+            # The per-strategy analytics only read these returns, so fetch them once;
+            # after that each strategy is independent pandas/numpy work with no DB
+            # access, and the three run in parallel threads
+            daily_returns = self._get_daily_returns()
             
-            # Extract portfolios from optimization result
-            for strategy_type, portfolio in base_optimization.portfolios.items():
+            def enhance(item):
+                strategy_type, portfolio = item
                 logger.info(f"Enhancing {strategy_type.value} portfolio with analytics")
                 
                 # Run comprehensive analytics for this portfolio
-                enhanced_result = self._enhance_portfolio_with_analytics(
-                    portfolio, request, strategy_type
+                return self._enhance_portfolio_with_analytics(
+                    portfolio, request, strategy_type, daily_returns
                 )
-                enhanced_results.append(enhanced_result)
+            
+            portfolios = list(base_optimization.portfolios.items())
+            with ThreadPoolExecutor(max_workers=max(1, len(portfolios))) as pool:
+                enhanced_results = list(pool.map(enhance, portfolios))
             
             logger.info("Enhanced portfolio optimization completed successfully")
             return enhanced_results
@@ -216,14 +223,15 @@ class EnhancedPortfolioOptimizer:
         self, 
         base_portfolio: OptimizedPortfolio, 
         request: PortfolioRequest,
-        strategy_type: StrategyType
+        strategy_type: StrategyType,
+        daily_returns: Optional[pd.DataFrame]
     ) -> EnhancedPortfolioResult:
         """
         Enhance a base portfolio result with comprehensive analytics
         """
         try:
             # Get historical portfolio data for analysis
-            portfolio_data = self._get_portfolio_historical_data(base_portfolio.allocation)
+            portfolio_data = self._get_portfolio_historical_data(base_portfolio.allocation, daily_returns)
             
             # Crisis period analysis
             crisis_analysis = self._analyze_crisis_periods(portfolio_data, base_portfolio.allocation)
@@ -683,15 +691,31 @@ class EnhancedPortfolioOptimizer:
             logger.error(f"Error generating account specific notes: {str(e)}")
             return ["Portfolio optimized for your account type and risk tolerance"]
     
-    def _get_portfolio_historical_data(self, allocation: Dict[str, float]) -> pd.DataFrame:
+    def _get_daily_returns(self) -> Optional[pd.DataFrame]:
         """
-        Create historical portfolio performance data from allocation weights
+        Daily asset returns over the full dataset, or None if they can't be loaded
         """
         try:
             # Get the same historical data used for optimization using base optimizer
             historical_data = self.base_optimizer._get_historical_data(20)  # Use full 20-year dataset
             returns_stats = self.base_optimizer._calculate_returns_statistics(historical_data)
-            daily_returns = returns_stats['returns']
+            return returns_stats['returns']
+            
+        except Exception as e:
+            logger.error(f"Error loading historical returns: {str(e)}")
+            return None
+    
+    def _get_portfolio_historical_data(
+        self, 
+        allocation: Dict[str, float], 
+        daily_returns: Optional[pd.DataFrame]
+    ) -> pd.DataFrame:
+        """
+        Create historical portfolio performance data from allocation weights
+        """
+        try:
+            if daily_returns is None:
+                raise ValueError("No historical returns available")
             
             # Calculate portfolio daily returns
             portfolio_returns = pd.Series(0.0, index=daily_returns.index)
@@ -0,0 +1,8 @@
+"""
+Shared test setup: point the app at a throwaway SQLite database
+"""
+import os
+import tempfile
+
+# Must run before src.models.database is imported, which reads DATABASE_URL
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
@@ -0,0 +1,30 @@
+"""
+Tests for the static analysis GET endpoints
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.analysis_routes import router
+from src.api.http_cache import STATIC_CACHE_CONTROL
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/api/analyze/crisis-periods", "/api/analyze/examples"])
+def test_static_payload_is_revalidated_by_etag(client, path):
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.json()
+    assert response.headers["cache-control"] == STATIC_CACHE_CONTROL
+
+    etag = response.headers["etag"]
+    assert client.get(path).headers["etag"] == etag  # stable across requests
+    not_modified = client.get(path, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
@@ -0,0 +1,187 @@
+"""
+Tests for the backtest endpoint helpers
+"""
+import asyncio
+import threading
+import time
+
+import numpy as np
+import orjson
+import pytest
+
+from src.api import backtesting
+
+
+def test_performance_metrics_coerce_numpy_scalars():
+    metrics = backtesting._performance_metrics({
+        "total_return": np.float64(1.5),
+        "cagr": np.float32(0.25),
+        "total_trading_days": np.int64(2520),
+        "years": 10.0,  # engine extras are dropped
+    })
+    assert type(metrics.total_return) is float
+    assert type(metrics.total_trading_days) is int
+    assert orjson.loads(orjson.dumps(metrics.model_dump())) == {
+        "total_return": 1.5, "cagr": 0.25, "volatility": 0.0, "max_drawdown": 0.0,
+        "sharpe_ratio": 0.0, "sortino_ratio": 0.0, "win_rate": 0.0, "total_trading_days": 2520,
+    }
+
+
+def _backtest_request(end_date="2024-12-31"):
+    return backtesting.BacktestRequest(
+        allocation={"allocation": {"VTI": 0.6, "BND": 0.4}},
+        end_date=end_date
+    )
+
+
+def _recorded_prefetches(monkeypatch):
+    started = []
+
+    async def fake_prefetch(key, request):
+        started.append(request.end_date)
+        backtesting._PREFETCH_INFLIGHT.discard(key)
+
+    monkeypatch.setattr(backtesting, "_prefetch_backtest", fake_prefetch)
+    monkeypatch.setattr(backtesting, "_PREFETCH_HITS", backtesting.OrderedDict())
+    return started
+
+
+async def _hit_twice(request):
+    key = backtesting._result_cache_key(request.allocation.allocation, request)
+    for _ in range(backtesting.PREFETCH_MIN_HITS):
+        backtesting._maybe_prefetch_next_window(key, request)
+    await asyncio.sleep(0)
+
+
+async def test_prefetch_is_off_by_default(monkeypatch):
+    started = _recorded_prefetches(monkeypatch)
+    monkeypatch.setattr(backtesting, "PREFETCH_ENABLED", False)
+    await _hit_twice(_backtest_request())
+    assert started == []
+
+
+async def test_prefetch_requests_next_window_when_idle(monkeypatch):
+    started = _recorded_prefetches(monkeypatch)
+    monkeypatch.setattr(backtesting, "PREFETCH_ENABLED", True)
+    await _hit_twice(_backtest_request())
+    assert started == ["2025-01-01"]
+
+
+async def test_prefetch_skipped_while_backtests_run(monkeypatch):
+    started = _recorded_prefetches(monkeypatch)
+    monkeypatch.setattr(backtesting, "PREFETCH_ENABLED", True)
+    monkeypatch.setitem(backtesting._BACKTEST_INFLIGHT, ("other",), asyncio.get_running_loop().create_future())
+    await _hit_twice(_backtest_request())
+    assert started == []
+
+
+def _cached_response(final_value):
+    return backtesting.BacktestResponse(
+        allocation={"VTI": 0.6, "BND": 0.4},
+        initial_value=10000.0,
+        final_value=final_value,
+        performance_metrics=backtesting._performance_metrics({})
+    )
+
+
+def test_result_cache_key_ignores_allocation_order():
+    request = _backtest_request()
+    assert backtesting._result_cache_key({"VTI": 0.6, "BND": 0.4}, request) == \
+        backtesting._result_cache_key({"BND": 0.4, "VTI": 0.6}, request)
+    assert backtesting._result_cache_key({"VTI": 0.6, "BND": 0.4}, request) != \
+        backtesting._result_cache_key({"VTI": 0.6, "BND": 0.4}, _backtest_request("2023-12-29"))
+
+
+def test_result_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(backtesting, "_RESULT_CACHE", backtesting.OrderedDict())
+    monkeypatch.setattr(backtesting, "RESULT_CACHE_MAX_SIZE", 2)
+    backtesting._cache_result(("a",), _cached_response(1.0))
+    backtesting._cache_result(("b",), _cached_response(2.0))
+    assert backtesting._get_cached_result(("a",)).final_value == 1.0  # now most recent
+    backtesting._cache_result(("c",), _cached_response(3.0))
+    assert backtesting._get_cached_result(("b",)) is None
+    assert backtesting._get_cached_result(("a",)) is not None
+    assert backtesting._get_cached_result(("c",)) is not None
+
+
+def test_invalidate_result_cache_drops_everything(monkeypatch):
+    monkeypatch.setattr(backtesting, "_RESULT_CACHE", backtesting.OrderedDict())
+    backtesting._cache_result(("a",), _cached_response(1.0))
+    backtesting.invalidate_result_cache()
+    assert backtesting._get_cached_result(("a",)) is None
+
+
+def test_result_cache_entries_expire(monkeypatch):
+    monkeypatch.setattr(backtesting, "_RESULT_CACHE", backtesting.OrderedDict())
+    now = [1000.0]
+    monkeypatch.setattr(backtesting.time, "monotonic", lambda: now[0])
+    backtesting._cache_result(("a",), _cached_response(1.0))
+    now[0] += backtesting.RESULT_CACHE_TTL_SECONDS - 1
+    assert backtesting._get_cached_result(("a",)) is not None
+    now[0] += 1
+    assert backtesting._get_cached_result(("a",)) is None
+    assert ("a",) not in backtesting._RESULT_CACHE
+
+
+def _fake_engine(monkeypatch, run):
+    """Replace the engine run (which needs price data) with run(request)"""
+    monkeypatch.setattr(backtesting, "_RESULT_CACHE", backtesting.OrderedDict())
+    monkeypatch.setattr(backtesting, "_backtest_with_own_session", run)
+
+
+async def test_identical_backtests_share_one_run(monkeypatch):
+    runs = []
+
+    def run(request):
+        runs.append(request.end_date)
+        time.sleep(0.05)
+        return {"final_value": 12345.0, "performance_metrics": {}}
+
+    _fake_engine(monkeypatch, run)
+    request = _backtest_request()
+    results = await asyncio.gather(*(backtesting._backtest_once(("same",), request) for _ in range(3)))
+    assert runs == ["2024-12-31"]
+    assert [shared for _, shared in results].count(False) == 1
+    assert all(response.final_value == 12345.0 for response, _ in results)
+    assert ("same",) not in backtesting._BACKTEST_INFLIGHT
+    assert backtesting._get_cached_result(("same",)).final_value == 12345.0
+
+
+async def test_shared_backtest_failure_reaches_every_caller(monkeypatch):
+    def run(request):
+        time.sleep(0.05)
+        raise ValueError("no price data")
+
+    _fake_engine(monkeypatch, run)
+    results = await asyncio.gather(
+        *(backtesting._backtest_once(("failing",), _backtest_request()) for _ in range(2)),
+        return_exceptions=True
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+    assert ("failing",) not in backtesting._BACKTEST_INFLIGHT
+
+
+async def test_cancelling_the_first_caller_does_not_cancel_the_run(monkeypatch):
+    release = threading.Event()
+
+    def run(request):
+        release.wait(5)
+        return {"final_value": 12345.0, "performance_metrics": {}}
+
+    _fake_engine(monkeypatch, run)
+    request = _backtest_request()
+    leader = asyncio.create_task(backtesting._backtest_once(("cancel",), request))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(backtesting._backtest_once(("cancel",), request))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    release.set()
+
+    response, shared = await follower
+    assert (response.final_value, shared) == (12345.0, True)
+    # The run finished on its own and cached its result
+    assert backtesting._get_cached_result(("cancel",)).final_value == 12345.0
+    assert ("cancel",) not in backtesting._BACKTEST_INFLIGHT
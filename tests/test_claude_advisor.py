@@ -0,0 +1,26 @@
+"""
+Tests for natural language request parsing in the portfolio advisor
+"""
+from src.ai.claude_advisor import ClaudePortfolioAdvisor, InvestorProfile
+
+
+def _parse(message):
+    return ClaudePortfolioAdvisor(None, None).parse_natural_language_request(message)
+
+
+def test_asset_preferences_follow_reporting_order():
+    parsed = _parse("Mix some Gold and REITs with bonds and international stocks")
+    assert parsed["specific_assets"] == ["VTIAX", "BND", "VNQ", "GLD"]
+
+
+def test_asset_keywords_match_as_substrings():
+    # "us" inside "focus" counts as domestic, as with the original `in` checks
+    assert _parse("focus on technology")["specific_assets"] == ["VTI", "QQQ"]
+    assert _parse("nothing relevant here")["specific_assets"] == []
+
+
+def test_profile_horizon_and_goals():
+    parsed = _parse("I want maximum growth and some dividend income for retirement")
+    assert parsed["risk_tolerance"] is InvestorProfile.AGGRESSIVE
+    assert parsed["investment_horizon"] == "long_term"
+    assert parsed["goals"] == ["income", "growth"]
@@ -0,0 +1,92 @@
+"""
+Tests for chat request classification
+"""
+import random
+
+import pytest
+
+from src.api import claude_routes
+from src.api.claude_routes import RequestClassifier
+
+_KEYWORDS_BY_PRIORITY = (
+    ("recovery_analysis", claude_routes.RECOVERY_KEYWORDS),
+    ("crisis_analysis", claude_routes.CRISIS_KEYWORDS),
+    ("rebalancing_analysis", claude_routes.REBALANCING_KEYWORDS),
+    ("rolling_analysis", claude_routes.ROLLING_KEYWORDS),
+    ("timeline_analysis", claude_routes.TIMELINE_KEYWORDS),
+)
+
+
+def _reference_request_type(message: str) -> str:
+    """Reference result: the original ordered any() checks over the keyword lists"""
+    message_lower = message.lower()
+    for request_type, keywords in _KEYWORDS_BY_PRIORITY:
+        if any(keyword in message_lower for keyword in keywords):
+            return request_type
+    return "new_portfolio"
+
+
+@pytest.mark.parametrize("message, request_type", [
+    ("How long did it take to recover after 2008?", "recovery_analysis"),
+    ("Stress test my portfolio against a crash", "crisis_analysis"),
+    ("When to rebalance with new money?", "rebalancing_analysis"),
+    ("Show rolling 5 year consistency", "rolling_analysis"),
+    ("I am near retirement", "timeline_analysis"),
+    ("Build me a growth portfolio", "new_portfolio"),
+    # A later, higher-priority keyword beats an earlier one
+    ("After the 2020 crash, how long was I underwater?", "recovery_analysis"),
+])
+def test_classify_request_routes_by_priority(message, request_type):
+    route = RequestClassifier().classify_request(message)
+    assert route["request_type"] == request_type
+    assert route["method"] == "POST"
+
+
+def test_classifier_matches_ordered_keyword_checks():
+    keywords = [keyword for _, group in _KEYWORDS_BY_PRIORITY for keyword in group]
+    filler = ["my", "portfolio", "please", "with", "the", "and", "xx"]
+    rng = random.Random(7)
+    classifier = RequestClassifier()
+    for _ in range(2000):
+        words = rng.choices(keywords + filler * 5, k=rng.randint(1, 8))
+        message = " ".join(words)
+        assert classifier.classify_request(message)["request_type"] == _reference_request_type(message)
+
+
+@pytest.mark.parametrize("message", ["STRESS TEST my portfolio", "Bear Market outlook", "what about CoViD"])
+def test_classification_ignores_case(message):
+    assert RequestClassifier().classify_request(message)["request_type"] == "crisis_analysis"
+
+
+def test_classification_is_memoized_by_digest(monkeypatch):
+    monkeypatch.setattr(claude_routes, "_CLASSIFICATION_CACHE", claude_routes.OrderedDict())
+    scans = []
+    match_request_type = claude_routes._match_request_type
+    monkeypatch.setattr(
+        claude_routes, "_match_request_type",
+        lambda message_lower: scans.append(message_lower) or match_request_type(message_lower)
+    )
+    classifier = RequestClassifier()
+    long_message = "How often should I rebalance? " * 1000
+    assert classifier.classify_request(long_message)["request_type"] == "rebalancing_analysis"
+    assert classifier.classify_request(long_message)["request_type"] == "rebalancing_analysis"
+    assert len(scans) == 1
+    # Keys are fixed-size digests, never the message text itself
+    assert [len(key) for key in claude_routes._CLASSIFICATION_CACHE] == [16]
+
+
+def test_classification_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(claude_routes, "_CLASSIFICATION_CACHE", claude_routes.OrderedDict())
+    monkeypatch.setattr(claude_routes, "CLASSIFICATION_CACHE_MAX_SIZE", 2)
+    classifier = RequestClassifier()
+    for message in ("crash", "rebalance", "rolling"):
+        classifier.classify_request(message)
+    assert len(claude_routes._CLASSIFICATION_CACHE) == 2
+
+
+def test_routes_are_shared_and_read_only():
+    classifier = RequestClassifier()
+    first = classifier.classify_request("crash")
+    assert classifier.classify_request("another crash") is first
+    with pytest.raises(TypeError):
+        first["endpoint"] = "/elsewhere"
@@ -0,0 +1,74 @@
+"""
+Tests for the AI agent chat route's answer cache
+"""
+from collections import OrderedDict
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api import claude_routes_enhanced as routes
+
+
+class FakeAgentResponse:
+    def __init__(self, synthesis_quality="good"):
+        self.synthesis_quality = synthesis_quality
+
+    def model_dump(self):
+        return {"recommendation": "Hold a balanced mix", "synthesis_quality": self.synthesis_quality}
+
+
+class FakeAgent:
+    def __init__(self, synthesis_quality="good"):
+        self.synthesis_quality = synthesis_quality
+        self.calls = 0
+
+    async def process_request(self, message, context):
+        self.calls += 1
+        return FakeAgentResponse(self.synthesis_quality)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(routes, "_AGENT_CACHE", OrderedDict())
+
+
+def _client(monkeypatch, agent):
+    monkeypatch.setattr(routes, "AGENT_AVAILABLE", True)
+    monkeypatch.setattr(routes, "ai_agent", agent, raising=False)
+    app = FastAPI()
+    app.include_router(routes.router)
+    return TestClient(app)
+
+
+def test_cache_key_normalizes_message_and_ignores_session():
+    context = {"sessionId": "a", "userPreferences": {"risk": "low"}}
+    key = routes._agent_cache_key("  Is this safe?  ", context)
+    assert key == routes._agent_cache_key("is this safe?", {**context, "sessionId": "b"})
+    assert key != routes._agent_cache_key("is this safe?", {"sessionId": "a", "userPreferences": {"risk": "high"}})
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(routes, "AGENT_CACHE_MAX_SIZE", 1)
+    routes._cache_agent_response("a", "first")
+    routes._cache_agent_response("b", "second")
+    assert routes._get_cached_agent_response("a") is None
+    assert routes._get_cached_agent_response("b") == "second"
+
+
+def test_repeated_question_is_answered_from_cache(monkeypatch):
+    agent = FakeAgent()
+    client = _client(monkeypatch, agent)
+    for _ in range(2):
+        response = client.post("/api/chat/recommend", json={"message": "Is this safe for retirement?"})
+        assert response.status_code == 200
+        assert response.json()["processing_mode"] == "ai_agent"
+    assert agent.calls == 1
+
+
+def test_poor_answers_are_not_cached(monkeypatch):
+    agent = FakeAgent(synthesis_quality="poor")
+    client = _client(monkeypatch, agent)
+    for _ in range(2):
+        client.post("/api/chat/recommend", json={"message": "Is this safe for retirement?"})
+    assert agent.calls == 2
@@ -0,0 +1,117 @@
+"""
+Tests for the data API routes, against the SQLite test database
+"""
+from datetime import date
+from decimal import Decimal
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api import data_routes
+from src.models.database import Base, SessionLocal, dispose_async_engine, engine
+from src.models.schemas import Asset, DailyPrice
+
+PRICES = [
+    (date(2024, 1, 2), Decimal("100.5"), 1000, Decimal("0")),
+    (date(2024, 1, 3), Decimal("101.25"), 1100, Decimal("0.35")),
+    (date(2024, 1, 4), Decimal("99.75"), 900, Decimal("0")),
+    (date(2024, 1, 5), Decimal("102"), 1200, Decimal("0")),
+    (date(2024, 1, 8), Decimal("103.5"), 800, Decimal("0")),
+]
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(engine)
+    session = SessionLocal()
+    session.add_all([
+        Asset(symbol="VTI", name="Total Stock Market", asset_class="US_EQUITY", expense_ratio=Decimal("0.0003")),
+        Asset(symbol="BND", name="Total Bond Market", asset_class="US_BONDS"),
+    ])
+    session.add_all([
+        DailyPrice(date=day, symbol="VTI", adj_close=adj_close, volume=volume, dividend=dividend)
+        for day, adj_close, volume, dividend in PRICES
+    ])
+    session.commit()
+    data_routes.invalidate_asset_cache()
+    yield session
+    session.close()
+    data_routes.invalidate_asset_cache()
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(data_routes.router)
+    with TestClient(app) as client:
+        yield client
+        # Pooled aiosqlite connections belong to this client's event loop
+        client.portal.call(dispose_async_engine)
+
+
+def test_prices_stream_a_price_data_response(client, monkeypatch):
+    # Several small batches exercise the separators between streamed chunks
+    monkeypatch.setattr(data_routes, "PRICE_STREAM_BATCH_SIZE", 2)
+    response = client.get("/api/data/prices/vti", params={"start_date": "2024-01-01", "end_date": "2024-01-31"})
+    assert response.status_code == 200
+    body = orjson.loads(response.content)
+    assert body["symbol"] == "VTI"
+    assert body["count"] == len(PRICES)
+    assert body["date_range"] == {"start": "2024-01-02", "end": "2024-01-08"}
+    assert [row["date"] for row in body["data"]] == [str(day) for day, *_ in PRICES]
+    assert body["data"][0] == {"date": "2024-01-02", "symbol": "VTI", "adj_close": 100.5, "volume": 1000, "dividend": None}
+    assert body["data"][1]["dividend"] == 0.35
+
+
+def test_prices_respect_the_date_range(client):
+    body = client.get("/api/data/prices/VTI", params={"start_date": "2024-01-03", "end_date": "2024-01-04"}).json()
+    assert body["count"] == 2
+    assert [row["date"] for row in body["data"]] == ["2024-01-03", "2024-01-04"]
+
+
+def test_prices_for_unknown_symbol_are_404(client):
+    assert client.get("/api/data/prices/XYZ").status_code == 404
+
+
+def test_prices_with_bad_dates_are_400(client):
+    assert client.get("/api/data/prices/VTI", params={"start_date": "01/02/2024"}).status_code == 400
+
+
+def _add_asset(db, symbol):
+    db.add(Asset(symbol=symbol, name=symbol, asset_class="OTHER"))
+    db.commit()
+
+
+def test_asset_list_is_served_from_memory_until_invalidated(client, db):
+    first = client.get("/api/data/assets").json()
+    assert first["count"] == 2
+    assert {asset["symbol"] for asset in first["assets"]} == {"VTI", "BND"}
+
+    _add_asset(db, "GLD")
+    assert client.get("/api/data/assets").json() == first
+
+    data_routes.invalidate_asset_cache()
+    assert client.get("/api/data/assets").json()["count"] == 3
+
+
+def test_asset_cache_reloads_after_its_ttl(client, db, monkeypatch):
+    client.get("/api/data/assets")
+    _add_asset(db, "GLD")
+    expires_at, assets, asset_list = data_routes._ASSET_CACHE
+    monkeypatch.setattr(data_routes, "_ASSET_CACHE", (0.0, assets, asset_list))
+    assert client.get("/api/data/assets").json()["count"] == 3
+
+
+def test_asset_info_comes_from_the_symbol_keyed_cache(client, db):
+    info = client.get("/api/data/assets/vti/info").json()
+    assert info == {"symbol": "VTI", "name": "Total Stock Market", "asset_class": "US_EQUITY", "expense_ratio": 0.0003}
+    assert client.get("/api/data/assets/BND/info").json()["expense_ratio"] is None
+
+    # Served from the same cache as the list, so a new row isn't visible yet
+    _add_asset(db, "GLD")
+    assert client.get("/api/data/assets/GLD/info").status_code == 404
+    data_routes.invalidate_asset_cache()
+    assert client.get("/api/data/assets/GLD/info").status_code == 200
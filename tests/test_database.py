@@ -0,0 +1,17 @@
+"""
+Tests for database pool configuration
+"""
+import pytest
+
+from src.models import database
+
+
+def test_pools_fit_the_per_process_budget():
+    database.check_pool_budget()
+    assert database.max_connections(database.ASYNC_POOL_SETTINGS) < database.max_connections(database.POOL_SETTINGS)
+
+
+def test_pools_over_budget_are_rejected(monkeypatch):
+    monkeypatch.setitem(database.POOL_SETTINGS, "max_overflow", 40)
+    with pytest.raises(ValueError, match="DB_MAX_CONNECTIONS_PER_PROCESS"):
+        database.check_pool_budget()
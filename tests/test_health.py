@@ -0,0 +1,38 @@
+"""
+Tests for the cached /health probe
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import main
+
+
+@pytest.fixture
+def client():
+    main._HEALTH.update(checked_at=float("-inf"), database=None)
+    with TestClient(main.app) as client:
+        yield client
+
+
+def test_health_reports_database(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+    assert response.json()["database"] == "connected"
+    assert response.headers["etag"] == 'W/"healthy-connected"'
+    assert response.headers["cache-control"] == "no-cache"
+
+
+def test_health_revalidates_with_its_own_etag(client):
+    etag = client.get("/health").headers["etag"]
+    response = client.get("/health", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_health_reuses_recent_probe(client, monkeypatch):
+    client.get("/health")
+    calls = []
+    monkeypatch.setattr(main, "async_session", lambda: calls.append(1))
+    assert client.get("/health").status_code == 200
+    assert calls == []
@@ -0,0 +1,86 @@
+"""
+Tests for the ETag / conditional GET helpers
+"""
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.api.http_cache import HTML_CACHE_CONTROL, StaticFile, StaticJSONPayload, STATIC_CACHE_CONTROL
+
+PAGE = b"<html><body>portfolio</body></html>"
+
+
+@pytest.fixture
+def client(tmp_path):
+    page_path = tmp_path / "page.html"
+    page_path.write_bytes(PAGE)
+    page = StaticFile(str(page_path))
+    missing = StaticFile(str(tmp_path / "missing.html"))
+    payload = StaticJSONPayload({"strategies": ["balanced"]})
+
+    app = FastAPI()
+
+    @app.get("/page")
+    async def serve_page(request: Request):
+        return page.response(request)
+
+    @app.get("/missing")
+    async def serve_missing(request: Request):
+        return missing.response(request)
+
+    @app.get("/payload")
+    async def serve_payload(request: Request):
+        return payload.response(request)
+
+    return TestClient(app)
+
+
+def test_json_payload_revalidates(client):
+    response = client.get("/payload")
+    assert response.json() == {"strategies": ["balanced"]}
+    assert response.headers["cache-control"] == STATIC_CACHE_CONTROL
+    assert client.get("/payload", headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+
+
+def test_weak_form_of_a_strong_tag_matches(client):
+    etag = client.get("/payload").headers["etag"]
+    assert client.get("/payload", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+    assert client.get("/payload", headers={"If-None-Match": '"other", ' + etag}).status_code == 304
+    assert client.get("/payload", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_page_is_gzipped_when_accepted(client):
+    response = client.get("/page", headers={"Accept-Encoding": "gzip, deflate"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == PAGE  # httpx decodes the body
+    assert response.headers["cache-control"] == HTML_CACHE_CONTROL
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+@pytest.mark.parametrize("accept_encoding", ["identity", "gzip;q=0", "br, gzip;q=0.0", "*;q=0"])
+def test_page_is_plain_when_gzip_refused(client, accept_encoding):
+    response = client.get("/page", headers={"Accept-Encoding": accept_encoding})
+    assert "content-encoding" not in response.headers
+    assert response.content == PAGE
+
+
+def test_wildcard_accepts_gzip(client):
+    response = client.get("/page", headers={"Accept-Encoding": "*"})
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_each_encoding_has_its_own_etag(client):
+    plain = client.get("/page", headers={"Accept-Encoding": "identity"}).headers["etag"]
+    gzipped = client.get("/page", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    assert plain != gzipped
+
+    # A tag only revalidates the representation it was issued for
+    assert client.get("/page", headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped}).status_code == 304
+    assert client.get("/page", headers={"Accept-Encoding": "identity", "If-None-Match": plain}).status_code == 304
+    response = client.get("/page", headers={"Accept-Encoding": "gzip", "If-None-Match": plain})
+    assert response.status_code == 200
+    assert response.content == PAGE
+
+
+def test_missing_page_is_404(client):
+    assert client.get("/missing").status_code == 404
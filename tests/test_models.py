@@ -0,0 +1,46 @@
+"""
+Tests for API request model validation
+"""
+import pytest
+from pydantic import ValidationError
+
+from src.api.models import PortfolioAllocation, SevenAssetPortfolioAllocation
+
+
+def test_valid_allocation_is_accepted():
+    allocation = PortfolioAllocation(allocation={"VTI": 0.6, "VTIAX": 0.3, "BND": 0.1})
+    assert allocation.allocation == {"VTI": 0.6, "VTIAX": 0.3, "BND": 0.1}
+
+
+@pytest.mark.parametrize("allocation, message", [
+    ({}, "Allocation cannot be empty"),
+    ({"VTI": 0.6, "BND": 0.3}, "must sum to 1.0"),
+    ({"VTI": 1.2, "BND": -0.2}, "cannot be negative"),
+    ({"VTI": 0.5, "XYZ": 0.3, "ABC": 0.2}, "Invalid asset symbols"),
+    ({"VTI": 1.0}, "at least 2 assets"),
+])
+def test_each_error_path(allocation, message):
+    with pytest.raises(ValidationError, match=message):
+        PortfolioAllocation(allocation=allocation)
+
+
+def test_bad_sum_is_reported_before_bad_symbols():
+    with pytest.raises(ValidationError, match="must sum to 1.0"):
+        PortfolioAllocation(allocation={"VTI": 0.5, "XYZ": 0.3})
+
+
+def test_invalid_symbols_are_all_reported():
+    with pytest.raises(ValidationError) as excinfo:
+        PortfolioAllocation(allocation={"VTI": 0.5, "XYZ": 0.3, "ABC": 0.2})
+    assert "XYZ" in str(excinfo.value) and "ABC" in str(excinfo.value)
+
+
+def test_seven_asset_allocation_reuses_validation():
+    with pytest.raises(ValidationError, match="cannot be negative"):
+        SevenAssetPortfolioAllocation(allocation={"VTI": 1.2, "BND": -0.2})
+
+
+def test_allocation_is_frozen():
+    allocation = PortfolioAllocation(allocation={"VTI": 0.5, "BND": 0.5})
+    with pytest.raises(ValidationError):
+        allocation.allocation = {"VTI": 1.0}